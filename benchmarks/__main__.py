@@ -0,0 +1,51 @@
+import sys
+import json
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import report
+from benchmarks.suite import run, load, compare
+
+
+# usage:
+#   python -m benchmarks run -o before.json
+#   python -m benchmarks run -k build -o after.json
+#   python -m benchmarks compare before.json after.json
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run benchmarks")
+    run_parser.add_argument("-k", dest="pattern", default=None,
+                            help="run benchmarks whose names contain it")
+    run_parser.add_argument("-r", "--repeat", type=int, default=5)
+    run_parser.add_argument("-o", "--output", default=None,
+                            help="write results to a JSON file")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("-t", "--threshold", type=float, default=0.1,
+                                help="relative change reported as slower or faster")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        with tempfile.TemporaryDirectory() as tmp:
+            results = run(Path(tmp), args.pattern, args.repeat,
+                          progress=lambda case, r: report(case, r["seconds"], r["peak"]))
+        if args.output is not None:
+            Path(args.output).write_text(json.dumps(results, indent=2))
+        return 0
+
+    rows = compare(load(args.old), load(args.new), args.threshold)
+    for case, before, after, status in rows:
+        print(f"{case:<40} {before * 1e3:>10.2f} ms {after * 1e3:>10.2f} ms "
+              f"{after / before:>6.2f}x {status}")
+    # non-zero exit code, so regressions fail CI jobs
+    return int(any(status == "slower" for *_, status in rows))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import yaml     # type: ignore
+
+from jetcon.node import JetNode
+from jetcon.read import read_yaml
+
+from benchmarks.common import measure, report
+from benchmarks.generators import deep_tree
+
+
+# baseline conversion converted every subtree twice per level,
+# its time doubles with every level, so it is measured on shallow trees only
+LEGACY_DEPTH = 8
+
+
+def _legacy_to_node(
+    node: Any
+) -> Any:
+    if isinstance(node, list):
+        return [_legacy_to_node(v) for v in node]
+    if isinstance(node, dict):
+        return _LegacyNode({k: _legacy_to_node(v) for k, v in node.items()})
+    return node
+
+
+class _LegacyNode(JetNode):
+    def __init__(self, cfg: dict = {}) -> None:
+        super().__init__({k: _legacy_to_node(v) for k, v in cfg.items()},
+                         recursive=False)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for depth in (1, 4, 8, 16, 64, 256):
+            tree = deep_tree(depth)
+            path = Path(tmp) / f"deep_{depth}.yaml"
+            path.write_text(yaml.safe_dump(tree))
+
+            if depth <= LEGACY_DEPTH:
+                report(f"JetNode legacy, depth {depth}", *measure(lambda: _LegacyNode(tree)))
+            report(f"JetNode, depth {depth}", *measure(lambda: JetNode(tree)))
+            report(f"read_yaml, depth {depth}", *measure(lambda: read_yaml(path)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+from copy import deepcopy
+
+from jetcon.node import JetNode
+from jetcon.build import build
+from jetcon.cast import to_dict
+
+from benchmarks.common import measure, report
+from benchmarks.generators import literal_tree
+
+
+def main() -> None:
+    tree = JetNode(literal_tree())
+
+    # baseline pipelines deep copied the whole tree before processing it
+    report("build (deepcopy)", *measure(lambda: build(deepcopy(tree))))
+    report("build", *measure(lambda: build(tree)))
+    report("to_dict (deepcopy)", *measure(lambda: to_dict(deepcopy(tree))))
+    report("to_dict", *measure(lambda: to_dict(tree)))
+
+
+if __name__ == "__main__":
+    main()
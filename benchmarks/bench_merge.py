@@ -0,0 +1,67 @@
+import re
+from typing import Any
+
+from jetcon.node import JetNode, _copy
+from jetcon.merge import merge
+
+from benchmarks.common import measure, report
+
+EXTRACT_PATTERN = re.compile("[a-z0-9_]+", re.IGNORECASE)
+MERGABLE_PATTERN = re.compile("[a-z0-9_]+!", re.IGNORECASE)
+SYNTAX_PATTERN = re.compile("[a-z0-9_]+!?", re.IGNORECASE)
+
+
+# baseline engine, keys were parsed with regular expressions
+# several times per level and looked up twice to find "!" variants
+def _legacy_key(key: str) -> str:
+    if re.fullmatch(SYNTAX_PATTERN, key) is None:
+        raise SyntaxError(f"Undefinded key syntax: {key}")
+    return re.findall(EXTRACT_PATTERN, key)[0]
+
+
+def _legacy_get(key: str, node: JetNode) -> Any:
+    key = _legacy_key(key)
+    if key in node:
+        return node[key], key
+    return node[key + "!"], key + "!"
+
+
+def _legacy_merge(dst: Any, src: Any) -> Any:
+    if isinstance(dst, JetNode) and isinstance(src, JetNode):
+        keys = {_legacy_key(k) for k in dst}
+        for k in {_legacy_key(k) for k in src} & keys:
+            sv, sk = _legacy_get(k, src)
+            dv, dk = _legacy_get(k, dst)
+            mergable = not re.fullmatch(MERGABLE_PATTERN, sk)
+            dst[dk] = _legacy_merge(dv, sv) if mergable else sv
+        for k in {_legacy_key(k) for k in src} - keys:
+            dst[k] = _legacy_get(k, src)[0]
+        return dst
+    return src
+
+
+def wide_tree(
+    keys: int = 10000,
+    offset: int = 0
+) -> JetNode:
+    # wide sections with some nested and replaced keys
+    return JetNode({
+        "section": {
+            **{f"key_{i + offset}": i for i in range(keys)},
+            **{f"nested_{i}": {"a": i, "b": [i]} for i in range(0, keys, 10)},
+            **{f"replaced_{i}!": {"c": i} for i in range(0, keys, 100)},
+        }
+    })
+
+
+def main() -> None:
+    dst, src = wide_tree(), wide_tree(offset=5000)
+    assert _legacy_merge(_copy(dst), _copy(src)) == merge(_copy(dst), _copy(src))
+
+    report("copy", *measure(lambda: (_copy(dst), _copy(src))))
+    report("merge legacy, 10k keys", *measure(lambda: _legacy_merge(_copy(dst), _copy(src))))
+    report("merge, 10k keys", *measure(lambda: merge(_copy(dst), _copy(src))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import yaml     # type: ignore
+
+from jetcon.node import JetNode, _copy
+from jetcon.keywords import Keywords
+from jetcon.build import build, _build_one
+from jetcon.cast import to_dict
+from jetcon.read import read, read_yaml, _load
+from jetcon.interpolate import interpolate
+
+from benchmarks.common import measure, report
+from benchmarks.generators import literal_tree, wide_tree, chain_tree
+
+
+def _legacy_copy(
+    node: Any
+) -> Any:
+    if isinstance(node, list):
+        return [_legacy_copy(v) for v in node]
+    if isinstance(node, JetNode):
+        return JetNode({k: _legacy_copy(v) for k, v in node.items()}, recursive=False)
+    return node
+
+
+def _legacy_to_dict(
+    node: Any
+) -> Any:
+    if isinstance(node, list):
+        return [_legacy_to_dict(v) for v in node]
+    if isinstance(node, JetNode):
+        return {k: _legacy_to_dict(v) for k, v in node.items()}
+    return node
+
+
+def _legacy_has_refs(
+    node: Any
+) -> bool:
+    if isinstance(node, list):
+        return any(_legacy_has_refs(v) for v in node)
+    if isinstance(node, JetNode):
+        return Keywords.ref.value in node or any(_legacy_has_refs(v) for v in node.values())
+    return False
+
+
+def _legacy_build_node(
+    node: Any
+) -> Any:
+    if isinstance(node, list):
+        return [_legacy_build_node(v) for v in node]
+    if isinstance(node, JetNode):
+        node = JetNode({k: _legacy_build_node(v) for k, v in node.items()}, recursive=False)
+        return _build_one(node, True)
+    return node
+
+
+def _legacy_build(
+    node: Any
+) -> Any:
+    # trees without references are built as is
+    _legacy_has_refs(node)
+    return _legacy_build_node(node)
+
+
+def _legacy_read(
+    path: Path
+) -> Any:
+    # parse copied the cached tree, compose rebuilt it recursively
+    # and interpolate copied it once more
+    tree = _legacy_copy(_load(path, read_yaml))
+    tree = _legacy_copy(tree)
+    return interpolate(tree)
+
+
+def main() -> None:
+    trees = [("literal", JetNode(literal_tree())), ("wide", JetNode(wide_tree())),
+             ("deep", JetNode(chain_tree(300)))]
+    for name, tree in trees:
+        for op, legacy, fn in (("copy", _legacy_copy, _copy),
+                               ("to_dict", _legacy_to_dict, to_dict),
+                               ("build", _legacy_build, build)):
+            report(f"{op} legacy, {name}", *measure(lambda: legacy(tree)))
+            report(f"{op}, {name}", *measure(lambda: fn(tree)))
+
+    # read of a single file, i.e. parse, compose and interpolate
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "wide.yaml"
+        path.write_text(yaml.safe_dump(wide_tree()))
+        report("read legacy, wide", *measure(lambda: _legacy_read(path)))
+        report("read, wide", *measure(lambda: read(path)))
+
+    # recursive walkers fail on trees deeper than the recursion limit
+    tree = JetNode(chain_tree(5000))
+    try:
+        _legacy_build(tree)
+    except RecursionError:
+        print("build legacy, depth 5000: RecursionError")
+    report("build, depth 5000", *measure(lambda: build(tree)))
+
+
+if __name__ == "__main__":
+    main()
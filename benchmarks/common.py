@@ -0,0 +1,53 @@
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable
+from dataclasses import dataclass
+
+
+class Record:
+    # trivial factory for builder nodes
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+@dataclass
+class Layer:
+    size: int
+    act: str = "relu"
+
+
+@dataclass
+class Block:
+    name: str
+    size: int
+    layer: Layer
+
+
+def measure(
+    fn: Callable[[], Any],
+    repeat: int = 5
+) -> tuple[float, int]:
+    # best wall time over several runs and peak allocated memory of one run
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings), peak
+
+
+def report(
+    name: str,
+    seconds: float,
+    peak: int
+) -> None:
+    print(f"{name:<40} {seconds * 1e3:>10.2f} ms {peak / 2 ** 20:>10.2f} MiB")
+
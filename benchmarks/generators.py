@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import yaml     # type: ignore
+
+# Generators of synthetic configs. Trees are plain data, as parsed from
+# files, so they can be dumped as is or wrapped with JetNode. Builder nodes
+# use factories of benchmarks.common.
+
+
+def literal_tree(
+    sections: int = 10,
+    size: int = 10000
+) -> dict:
+    # config with large literal lists, e.g. class lists and vocabularies
+    return {
+        f"section_{i}": {
+            "_cls_": "benchmarks.common.Record",
+            "classes": [f"class_{j}" for j in range(size)],
+            "weights": [float(j) for j in range(size)],
+        }
+        for i in range(sections)
+    }
+
+
+def wide_tree(
+    sections: int = 1000,
+    layers: int = 8
+) -> dict:
+    # many small sections, i.e. the tree is mostly containers
+    return {
+        f"section_{i}": {
+            "_cls_": "benchmarks.common.Record",
+            "optim": {"lr": 0.1, "betas": [0.9, 0.99]},
+            "layers": [{"size": j, "act": "relu"} for j in range(layers)],
+        }
+        for i in range(sections)
+    }
+
+
+def deep_tree(
+    depth: int,
+    leaves: int = 2 ** 14
+) -> dict:
+    # chain of nested sections, every level holds the same number of
+    # leaves, so the tree size does not depend on depth
+    width = max(leaves // depth, 1)
+    tree: dict = {f"leaf_{j}": j for j in range(width)}
+    for i in range(depth - 1):
+        tree = {"child": tree, **{f"leaf_{j}": j for j in range(width)}}
+    return tree
+
+
+def chain_tree(
+    depth: int
+) -> dict:
+    # chain of small sections with a builder node at the bottom
+    tree: dict = {"_cls_": "benchmarks.common.Record", "a": 1}
+    for i in range(depth - 1):
+        tree = {"child": tree, "items": [i, {"a": i}]}
+    return tree
+
+
+def interpolation_tree(
+    values: int = 1000,
+    chain: int = 10
+) -> dict:
+    # every value is referenced by a chain of interpolated strings,
+    # so slots depend on each other and are resolved in order
+    tree: dict = {"base": {f"value_{i}": i for i in range(values)}}
+    for k in range(chain):
+        prev = "base.value" if k == 0 else f"ref_{k - 1}.value"
+        tree[f"ref_{k}"] = {f"value_{i}": f"${{{prev}_{i}}}" for i in range(values)}
+    tree["mixed"] = {f"value_{i}": f"${{base.value_{i}}}/${{ref_0.value_{i}}}"
+                     for i in range(values)}
+    return tree
+
+
+def dataclass_tree(
+    blocks: int = 1000
+) -> dict:
+    # typed builder nodes, every block is a dataclass holding another one
+    return {
+        "blocks": [
+            {
+                "_data_": "benchmarks.common.Block",
+                "name": f"block_{i}",
+                "size": i,
+                "layer": {"_data_": "benchmarks.common.Layer", "size": i, "act": "relu"},
+            }
+            for i in range(blocks)
+        ]
+    }
+
+
+def import_dag(
+    root: Path,
+    levels: int = 3,
+    width: int = 4,
+    fan_out: int = 3,
+    keys: int = 100
+) -> Path:
+    # files are arranged in levels, every file imports fan_out files of the
+    # next level into its own sections, so files of deeper levels are
+    # imported by several files (fan-in). returns the root config.
+    root.mkdir(parents=True, exist_ok=True)
+    for level in reversed(range(levels)):
+        for i in range(1 if level == 0 else width):
+            tree: dict = {"section": {f"key_{j}": f"{level}_{i}_{j}" for j in range(keys)}}
+            if level + 1 < levels:
+                for k in range(fan_out):
+                    dep = f"./level_{level + 1}_{(i + k) % width}.yaml"
+                    tree[f"dep_{k}"] = {"_import_": [dep]}
+            (root / f"level_{level}_{i}.yaml").write_text(yaml.safe_dump(tree))
+    return root / "level_0_0.yaml"
@@ -0,0 +1,227 @@
+import json
+import time
+import platform
+import itertools
+import subprocess
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml     # type: ignore
+
+from jetcon.node import JetNode, _copy
+from jetcon.read import read, invalidate_cache
+from jetcon.merge import merge
+from jetcon.interpolate import interpolate
+from jetcon.build import build
+from jetcon.cast import cast, to_dict
+from jetcon.save import save
+
+from benchmarks.common import Block, measure
+from benchmarks.generators import (
+    wide_tree,
+    deep_tree,
+    chain_tree,
+    interpolation_tree,
+    dataclass_tree,
+    import_dag,
+)
+
+# This registry maps benchmark names to setup functions and parameter grids.
+# Each setup function takes a scratch directory and one combination of
+# parameters, returning the function to measure. Setup is not measured.
+BENCHMARKS: dict[str, tuple[Callable[..., Callable[[], Any]], dict[str, list]]] = dict()
+
+# Version of the results format, results of other versions are not compared.
+VERSION = 1
+
+
+def benchmark(
+    name: str,
+    **params: list
+) -> Callable:
+    # registers a setup function, it is called for every combination of params
+    def register(setup: Callable[..., Callable[[], Any]]) -> Callable:
+        BENCHMARKS[name] = (setup, params)
+        return setup
+    return register
+
+
+@benchmark("read.parse", sections=[100, 1000])
+def _read_parse(tmp: Path, sections: int) -> Callable[[], Any]:
+    path = tmp / f"wide_{sections}.yaml"
+    path.write_text(yaml.safe_dump(wide_tree(sections)))
+
+    def run() -> Any:
+        # parse cache is dropped, so the file is parsed every time
+        invalidate_cache()
+        return read(path, compose=False)
+    return run
+
+
+@benchmark("read.compose", levels=[2, 4], fan_out=[2, 4])
+def _read_compose(tmp: Path, levels: int, fan_out: int) -> Callable[[], Any]:
+    # parsed files are cached, so it measures composition of imports
+    path = import_dag(tmp / f"dag_{levels}_{fan_out}", levels=levels, fan_out=fan_out)
+    read(path)
+    return lambda: read(path)
+
+
+@benchmark("merge", sections=[100, 1000])
+def _merge(tmp: Path, sections: int) -> Callable[[], Any]:
+    dst = JetNode(wide_tree(sections))
+    src = JetNode(wide_tree(sections // 2, layers=4))
+    # merge modifies dst in place, the copy is measured by "copy"
+    return lambda: merge(_copy(dst), src)
+
+
+@benchmark("interpolate", values=[100, 1000], chain=[1, 10])
+def _interpolate(tmp: Path, values: int, chain: int) -> Callable[[], Any]:
+    tree = JetNode(interpolation_tree(values, chain))
+    return lambda: interpolate(tree)
+
+
+@benchmark("build.wide", sections=[100, 1000])
+def _build_wide(tmp: Path, sections: int) -> Callable[[], Any]:
+    tree = JetNode(wide_tree(sections))
+    return lambda: build(tree)
+
+
+@benchmark("build.deep", depth=[100, 1000])
+def _build_deep(tmp: Path, depth: int) -> Callable[[], Any]:
+    tree = JetNode(chain_tree(depth))
+    return lambda: build(tree)
+
+
+@benchmark("build.dataclass", blocks=[100, 1000])
+def _build_dataclass(tmp: Path, blocks: int) -> Callable[[], Any]:
+    tree = JetNode(dataclass_tree(blocks))
+    return lambda: build(tree)
+
+
+@benchmark("cast", blocks=[100, 1000])
+def _cast(tmp: Path, blocks: int) -> Callable[[], Any]:
+    nodes = [JetNode({k: v for k, v in block.items() if k != "_data_"})
+             for block in dataclass_tree(blocks)["blocks"]]
+    for node in nodes:
+        del node.layer["_data_"]
+    return lambda: [cast(node, Block) for node in nodes]
+
+
+@benchmark("copy", sections=[100, 1000])
+def _copy_wide(tmp: Path, sections: int) -> Callable[[], Any]:
+    tree = JetNode(wide_tree(sections))
+    return lambda: _copy(tree)
+
+
+@benchmark("to_dict.wide", sections=[100, 1000])
+def _to_dict_wide(tmp: Path, sections: int) -> Callable[[], Any]:
+    tree = JetNode(wide_tree(sections))
+    return lambda: to_dict(tree)
+
+
+@benchmark("to_dict.deep", depth=[16, 256])
+def _to_dict_deep(tmp: Path, depth: int) -> Callable[[], Any]:
+    tree = JetNode(deep_tree(depth))
+    return lambda: to_dict(tree)
+
+
+@benchmark("save", sections=[100, 1000])
+def _save(tmp: Path, sections: int) -> Callable[[], Any]:
+    tree = JetNode(wide_tree(sections))
+    # existing files are never overwritten, so every run saves a new one
+    counter = itertools.count()
+    return lambda: save(tree, tmp / f"save_{sections}_{next(counter)}.yaml")
+
+
+def _cases(
+    pattern: str | None = None
+) -> list[tuple[str, Callable, dict[str, Any]]]:
+    # benchmark names with parameters, e.g. "build.deep[depth=100]"
+    cases = list()
+    for name, (setup, params) in BENCHMARKS.items():
+        for values in itertools.product(*params.values()):
+            kwargs = dict(zip(params, values))
+            case = name + "[" + ",".join(f"{k}={v}" for k, v in kwargs.items()) + "]"
+            if pattern is None or pattern in case:
+                cases.append((case, setup, kwargs))
+    return cases
+
+
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=Path(__file__).parent, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run(
+    tmp: Path,
+    pattern: str | None = None,
+    repeat: int = 5,
+    progress: Callable[[str, dict], Any] | None = None
+) -> dict:
+    """
+    Runs registered benchmarks.
+
+    Parameters
+    ----------
+    tmp : Path
+        Scratch directory for generated files.
+    pattern : str | None
+        If given, only benchmarks containing it are run, e.g. "build".
+    repeat : int
+        Number of measured runs, the best time is reported.
+    progress : Callable[[str, dict], Any] | None
+        Called with the name and the result of every benchmark.
+
+    Returns
+    -------
+    dict
+        Results with environment metadata, it is serializable to JSON.
+    """
+    results = dict()
+    for case, setup, kwargs in _cases(pattern):
+        seconds, peak = measure(setup(tmp, **kwargs), repeat=repeat)
+        results[case] = {"seconds": seconds, "peak": peak, "params": kwargs}
+        if progress is not None:
+            progress(case, results[case])
+
+    return {
+        "version": VERSION,
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def load(
+    path: str | Path
+) -> dict:
+    results = json.loads(Path(path).read_text())
+    if results.get("version", None) != VERSION:
+        raise ValueError(f"Unsupported results version in {path}.")
+    return results
+
+
+def compare(
+    old: dict,
+    new: dict,
+    threshold: float = 0.1
+) -> list[tuple[str, float, float, str]]:
+    # (name, old seconds, new seconds, status) of benchmarks present in both,
+    # status is "slower" or "faster" if the time changed more than threshold
+    rows = list()
+    for case, result in new["results"].items():
+        if case not in old["results"]:
+            continue
+        before, after = old["results"][case]["seconds"], result["seconds"]
+        ratio = after / before if before > 0 else 1.0
+        status = "slower" if ratio > 1 + threshold else \
+                 "faster" if ratio < 1 - threshold else ""
+        rows.append((case, before, after, status))
+    return rows
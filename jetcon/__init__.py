@@ -1,6 +1,15 @@
 from .config import JetConfig       # noqa: F401
-from .build import build, register_builder   # noqa: F401
-from .read import read, register_reader      # noqa: F401
+from .build import build, abuild, register_builder, clear_import_cache, BuildCache   # noqa: F401
+from .lazy import lazy_build, LazyNode      # noqa: F401
+from .read import read, register_reader, invalidate_cache, set_cache_size  # noqa: F401
 from .cast import cast, to_dict          # noqa: F401
 from .merge import merge        # noqa: F401
 from .interpolate import interpolate    # noqa: F401
+from .override import override      # noqa: F401
+from .diff import diff      # noqa: F401
+from .sweep import grid, zipped, sample      # noqa: F401
+from .backend import set_yaml_backend     # noqa: F401
+from .snapshot import read_snapshot, save_snapshot     # noqa: F401
+from .graph import ImportGraph, import_graph     # noqa: F401
+from .watch import watch, Watcher     # noqa: F401
+from .profile import profile, register_listener, remove_listener     # noqa: F401
@@ -0,0 +1,134 @@
+import os
+import yaml     # type: ignore
+from typing import Any
+
+from jetcon.node import JetNode, _copy
+
+
+def _construct_node(
+    loader: yaml.BaseLoader,
+    node: yaml.MappingNode
+):
+    # mappings are constructed as JetNodes during parsing, children are
+    # constructed first, so every node is created exactly once.
+    # two steps construction keeps the constructor's recursion shallow,
+    # as in pyyaml, so deep documents do not hit the recursion limit.
+    data = JetNode({}, recursive=False)
+    yield data
+    dict.update(data, loader.construct_mapping(node))
+
+
+def _dealias(
+    tree: Any,
+    mark: yaml.Mark | None = None
+) -> Any:
+    # aliases share the anchored node, every one of them is replaced by a
+    # copy, as with nodes converted from dicts, so mutations never leak to
+    # other keys. depth first with an explicit stack, containers on the
+    # current path are active, a reference to one of them is a recursive
+    # anchor, which can not be copied.
+    if not isinstance(tree, (JetNode, list)):
+        return tree
+
+    active, done = {id(tree)}, set()
+    stack = [(tree, iter(list(tree.items() if isinstance(tree, dict) else enumerate(tree))))]
+    while stack:
+        node, items = stack[-1]
+        for key, value in items:
+            if not isinstance(value, (JetNode, list)):
+                continue
+            if id(value) in active:
+                raise yaml.constructor.ConstructorError(
+                    None, None, "found unconstructable recursive node", mark)
+            if id(value) in done:
+                node[key] = _copy(value)
+                continue
+            active.add(id(value))
+            children = value.items() if isinstance(value, dict) else enumerate(value)
+            stack.append((value, iter(list(children))))
+            break
+        else:
+            stack.pop()
+            active.discard(id(node))
+            done.add(id(node))
+    return tree
+
+
+def _construct_document(
+    loader: yaml.BaseLoader,
+    node: yaml.Node
+) -> Any:
+    # aliases are copied once the document is constructed, since pyyaml
+    # fills collections after they are referenced
+    data = yaml.constructor.BaseConstructor.construct_document(loader, node)
+    return _dealias(data, node.start_mark)
+
+
+def _node_loader(
+    base: type
+) -> type:
+    loader = type(f"Node{base.__name__}", (base,), {"construct_document": _construct_document})
+    loader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _construct_node)
+    return loader
+
+
+# This registry maps backend names to (loader, dumper) pairs.
+# libyaml based classes are several times faster than pure python ones,
+# but they are available only when pyyaml is compiled with libyaml.
+# Loaders construct JetNodes instead of dicts.
+BACKENDS = {
+    "python": (_node_loader(yaml.SafeLoader), yaml.SafeDumper),
+}
+
+if getattr(yaml, "__with_libyaml__", False):
+    BACKENDS["c"] = (_node_loader(yaml.CSafeLoader), yaml.CSafeDumper)
+
+# Environment variable that forces backend, e.g. JETCON_YAML_BACKEND=python
+BACKEND_ENV = "JETCON_YAML_BACKEND"
+
+# Backend forced via set_yaml_backend, has priority over environment
+BACKEND: str | None = None
+
+
+def set_yaml_backend(
+    name: str | None
+) -> None:
+    """
+    Forces YAML backend used by readers and savers.
+
+    Parameters
+    ----------
+    name : str | None
+        The backend name, "c" or "python". If None, the backend is
+        selected from environment or the fastest available one is used.
+
+    Returns
+    -------
+    None
+    """
+    global BACKEND
+
+    if name is not None and name not in BACKENDS:
+        raise ValueError(f"Unknown or unavailable YAML backend: {name}. "
+                         f"Available backends: {list(BACKENDS)}")
+    BACKEND = name
+
+
+def get_yaml_backend() -> str:
+    name = BACKEND or os.environ.get(BACKEND_ENV, None)
+
+    if name is None:
+        return "c" if "c" in BACKENDS else "python"
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown or unavailable YAML backend: {name}. "
+                         f"Available backends: {list(BACKENDS)}")
+    return name
+
+
+def yaml_loader() -> type:
+    return BACKENDS[get_yaml_backend()][0]
+
+
+def yaml_dumper() -> type:
+    return BACKENDS[get_yaml_backend()][1]
@@ -1,18 +1,28 @@
 import inspect
 import importlib
+from asyncio import gather, ensure_future
+from weakref import WeakKeyDictionary
+from threading import Lock
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import Executor, wait
 from typing import get_type_hints
 from dataclasses import fields, is_dataclass, MISSING
-from typing import Callable, Any
+from typing import Callable, Any, NamedTuple, Iterator
+from itertools import groupby
 from functools import reduce
 from functools import partial as partial_fn
 from typeguard import check_type, TypeCheckError    # type: ignore
 
 from jetcon.keywords import Keywords
-from jetcon.node import JetNode
+from jetcon.node import JetNode, _copy
+from jetcon.walk import transform, walk, containers, DESCEND
+from jetcon.profile import LISTENERS, _start, _emit
 
 # This registry maps syntax keywords to builder functions.
 # Each builder function takes a string specification from a node's key and
 # additional keyword arguments, returning a constructed class instance.
+# Builders may return awaitables, they are awaited by abuild.
 BUILDERS = dict()
 
 
@@ -37,37 +47,83 @@ def register_builder(
     BUILDERS[keyword] = builder
 
 
-def _import_from_string(
-    spec: str,
-) -> Callable:
-
-    if not spec:
-        raise ValueError("Empty import string.")
-
-    specs = spec.split(".")
-    module_, var = spec.rsplit(".", 1)
-    vars_ = [var]
-
-    imported_module = None
-    for _ in specs:
-        try:
-            imported_module = importlib.import_module(module_)
-            break
-        except ImportError:
-            module_, var = module_.rsplit(".", 1)
-            vars_.insert(0, var)
-
-    if imported_module is None:
-        raise ImportError("Unknown string spec.")
-
-    return reduce(getattr, vars_, imported_module)
-
-
-def build_callable(
-    factory: Callable,
-    kwargs: dict[str, Any],
-    partial: bool,
-) -> Callable | Any:
+class CallPlan(NamedTuple):
+    # arguments without default values
+    required: frozenset[str]
+    # all named arguments
+    total: frozenset[str]
+    # whether **kwargs is accepted
+    kwargable: bool
+
+
+# This cache maps factories to their call plans, so signatures and type
+# hints are introspected once per factory instead of once per node.
+# Weak keys allow factories created at runtime to be garbage collected.
+CALL_PLANS: WeakKeyDictionary = WeakKeyDictionary()
+
+# This cache maps dataclasses to (name, default, resolved type) triplets of
+# their fields. Type hints are resolved only when a dataclass is built with
+# the dataclass builder, since dataclasses built as plain callables may have
+# annotations that cannot be resolved at runtime, e.g. under TYPE_CHECKING.
+DATACLASS_FIELDS: WeakKeyDictionary = WeakKeyDictionary()
+
+
+# This cache maps import specs to resolved objects or to errors of specs
+# that do not exist, so repeated specs are resolved once and bad specs fail
+# fast. Errors raised by existing modules are not cached.
+IMPORT_CACHE: OrderedDict[str, tuple[Any, tuple[type, tuple, BaseException | None] | None]] = OrderedDict()
+# Maximum number of cached specs, least recently used are evicted first.
+IMPORT_CACHE_SIZE = 1024
+# specs are resolved from executor threads during parallel builds
+IMPORT_LOCK = Lock()
+
+
+class BuildCache(MutableMapping):
+    # Thread safe LRU store of built objects shared between build calls.
+    # Keys are (builder, spec, partial, kwargs key) tuples, see _cache_key.
+    def __init__(
+        self,
+        maxsize: int = 128
+    ) -> None:
+        if maxsize < 0:
+            raise ValueError(f"Cache size must be non-negative, got {maxsize}.")
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            value = self._data[key]
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            # evict least recently used objects
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            del self._data[key]
+
+    def __iter__(self) -> Iterator:
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# default store used by build(cache=True)
+BUILD_CACHE = BuildCache()
+
+
+def _make_call_plan(
+    factory: Callable
+) -> CallPlan:
     # look for required arguments.
     required, total = set(), set()
     kwargable = False
@@ -86,6 +142,135 @@ def build_callable(
             continue
         required.add(arg.name)
 
+    return CallPlan(frozenset(required), frozenset(total), kwargable)
+
+
+def _call_plan(
+    factory: Callable
+) -> CallPlan:
+    try:
+        return CALL_PLANS[factory]
+    except KeyError:
+        pass
+    except TypeError:
+        # factory cannot be weakly referenced, so it is not cached
+        return _make_call_plan(factory)
+
+    plan = _make_call_plan(factory)
+    CALL_PLANS[factory] = plan
+    return plan
+
+
+def _make_fields(
+    factory: Callable
+) -> tuple[tuple[str, Any, Any], ...]:
+    # uses typing.get_type_hints to correctly parse type hints
+    # field.type can be str when `from __future__ import annotations`
+    # is used in module
+    hints = get_type_hints(factory)
+    return tuple((f.name, f.default, hints[f.name]) for f in fields(factory))
+
+
+def _dataclass_fields(
+    factory: Callable
+) -> tuple[tuple[str, Any, Any], ...]:
+    try:
+        return DATACLASS_FIELDS[factory]
+    except KeyError:
+        pass
+    except TypeError:
+        return _make_fields(factory)
+
+    fields_ = _make_fields(factory)
+    DATACLASS_FIELDS[factory] = fields_
+    return fields_
+
+
+def clear_import_cache() -> None:
+    """
+    Clears resolved import specs, e.g. after modules are reloaded.
+
+    Returns
+    -------
+    None
+    """
+    with IMPORT_LOCK:
+        IMPORT_CACHE.clear()
+
+
+def _resolve_spec(
+    spec: str,
+) -> tuple[Any, tuple[type, tuple, BaseException | None] | None]:
+    # (object, None) or (None, error) if the spec does not exist. errors
+    # raised by existing modules, e.g. their own missing dependencies,
+    # are propagated, since they are fixed without changing the spec.
+    parts = spec.split(".")
+
+    # the longest importable prefix is a module, the rest are attributes
+    missing = None
+    for i in range(len(parts) - 1, 0, -1):
+        name = ".".join(parts[:i])
+        try:
+            imported_module = importlib.import_module(name)
+        except ModuleNotFoundError as e:
+            # the prefix or one of its parent packages does not exist
+            if e.name is None or not (name + ".").startswith(e.name + "."):
+                raise
+            missing = e
+            continue
+        try:
+            return reduce(getattr, parts[i:], imported_module), None
+        except AttributeError as e:
+            return None, (AttributeError, e.args, e.with_traceback(None))
+
+    # tracebacks are dropped, cached errors would keep their frames alive
+    cause = missing.with_traceback(None) if missing is not None else None
+    return None, (ImportError, (f"Unknown string spec: {spec}.",), cause)
+
+
+def _import_from_string(
+    spec: str,
+) -> Callable:
+
+    if not spec:
+        raise ValueError("Empty import string.")
+
+    with IMPORT_LOCK:
+        cached = IMPORT_CACHE.get(spec, None)
+        if cached is not None:
+            IMPORT_CACHE.move_to_end(spec)
+
+    if cached is not None:
+        factory, error = cached
+        if error is not None:
+            # raise a new instance, cached one would collect tracebacks
+            raise error[0](*error[1]) from error[2]
+        return factory
+
+    start = _start() if LISTENERS else None
+    factory, error = _resolve_spec(spec)
+    if start is not None:
+        _emit("resolve", spec, (), start)
+
+    with IMPORT_LOCK:
+        IMPORT_CACHE[spec] = (factory, error)
+        # evict least recently used specs
+        while len(IMPORT_CACHE) > IMPORT_CACHE_SIZE:
+            IMPORT_CACHE.popitem(last=False)
+
+    if error is not None:
+        raise error[0](*error[1]) from error[2]
+    return factory
+
+
+def build_callable(
+    factory: Callable,
+    kwargs: dict[str, Any],
+    partial: bool,
+) -> Callable | Any:
+    plan = _call_plan(factory)
+    required, total, kwargable = plan.required, plan.total, plan.kwargable
+
     if len(required - kwargs.keys()) > 0:
         if not partial:
             raise ValueError(f"Can't build callable {factory} with partially initialized"
@@ -115,24 +300,20 @@ def build_dataclass(
     if not is_dataclass(factory):
         raise ValueError(f"Class {factory} is not dataclass")
 
-    for field in fields(factory):
+    for name, default, ftype in _dataclass_fields(factory):
         # fetch arg from node
-        arg = kwargs.get(field.name, field.default)
+        arg = kwargs.get(name, default)
 
         if arg is MISSING and partial:
             continue
 
-        # uses typing.get_type_hints to correctly parse type hints
-        # field.type can be str when `from __future__ import annotations`
-        # is used in module
-        ftype = get_type_hints(factory)[field.name]
         try:
             # check type using typeguard
             check_type(arg, ftype)
         except TypeCheckError:
             raise ValueError(
                 f"Dataclass {factory.__name__} typecheck error. "
-                f"Arg: {field.name} has type {type(arg)}, but {ftype} is expected."
+                f"Arg: {name} has type {type(arg)}, but {ftype} is expected."
             )
 
     return build_callable(factory, kwargs, partial)
@@ -172,45 +353,452 @@ def _resolve_builder(
     return specified.pop()
 
 
-def _build_node(
-    dct: dict,
-    partial: bool
-) -> dict:
-    return JetNode({k: _build(v, partial) for k, v in dct.items()})
+def _split_builder(
+    node: JetNode,
+    builder: str
+) -> tuple[Callable, JetNode]:
+    factory = _import_from_string(node[builder])
+    # collect kwargs into a new node, so the source tree stays untouched
+    kwargs = JetNode({k: v for k, v in node.items()
+                      if k != builder and k != Keywords.cache.value},
+                     recursive=False)
+    return factory, kwargs
 
 
-def _build_list(
-    lst: list,
-    partial: bool
-) -> list:
-    return [_build(v, partial) for v in lst]
+# scalars are compared by values, other objects by identities
+_SCALARS = (str, int, float, bool, type(None), bytes)
 
 
-def _build(
-    node: Any,
-    partial: bool = True
+def _cache_key(
+    value: Any
 ) -> Any:
-    if isinstance(node, list):
-        return _build_list(node, partial)
+    if type(value) in _SCALARS:
+        return type(value), value
 
-    if isinstance(node, JetNode):
-        return build(node, partial=partial)
+    if isinstance(value, JetNode):
+        return JetNode, tuple((k, _cache_key(v)) for k, v in value.items())
+
+    if isinstance(value, list):
+        return list, tuple(_cache_key(v) for v in value)
+
+    # e.g. objects built by nested builders. cache entries keep their
+    # kwargs alive, so ids are not reused while entries exist
+    return type(value), id(value)
+
+
+def _get_cache(
+    cache: MutableMapping | bool | None
+) -> MutableMapping | None:
+    if cache is True:
+        return BUILD_CACHE
+    if cache is False:
+        return None
+    return cache
+
+
+def _cached_key(
+    node: JetNode,
+    builder: str,
+    kwargs: JetNode,
+    partial: bool,
+    cache: MutableMapping | None
+) -> tuple | None:
+    # returns None for nodes that are not cached
+    if cache is None or node.get(Keywords.cache.value, True) is False:
+        return None
+    return builder, node[builder], partial, _cache_key(kwargs)
+
+
+def _build_one(
+    node: JetNode,
+    partial: bool,
+    cache: MutableMapping | None = None,
+    path: tuple = tuple()
+) -> Any:
+    builder = _resolve_builder(node)
+
+    if builder is not None:
+        start = _start() if LISTENERS else None
+        factory, kwargs = _split_builder(node, builder)
+
+        key = _cached_key(node, builder, kwargs, partial, cache)
+        if key is not None:
+            try:
+                return cache[key][0]
+            except KeyError:
+                pass
+
+        value = BUILDERS[builder](factory, kwargs=kwargs, partial=partial)
+        if key is not None:
+            cache[key] = (value, kwargs)
+        if start is not None:
+            _emit("build", node[builder], path, start)
+        return value
 
     return node
 
 
+def _has_refs(
+    node: Any
+) -> bool:
+    kw = Keywords.ref.value
+    return any(isinstance(v, JetNode) and kw in v
+               for v in containers(node, (JetNode, list)))
+
+
+def _find_ref(
+    tree: JetNode,
+    path: str,
+    chain: list[str]
+) -> Any:
+    # chain contains references being resolved, e.g. a -> b -> a
+    if path in chain:
+        raise RuntimeError("Circular references have been detected. "
+                           f"Reference chain: {' -> '.join(chain + [path])}.")
+    chain = chain + [path]
+
+    value = tree
+    for part in str(path).split("."):
+        value = _deref(tree, value, chain)
+        try:
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f"Unresolved reference: {path}.")
+
+    return _deref(tree, value, chain)
+
+
+def _deref(
+    tree: JetNode,
+    value: Any,
+    chain: list[str]
+) -> Any:
+    kw = Keywords.ref.value
+
+    if not isinstance(value, JetNode) or kw not in value:
+        return value
+
+    if len(value) > 1:
+        raise ValueError("Reference node cannot contain other keys. "
+                         f"Incorrect node: {value}.")
+    return _find_ref(tree, value[kw], chain)
+
+
+def _replace_refs(
+    tree: JetNode,
+    shared: set[int]
+) -> Any:
+    # replaces reference nodes with their targets in place. targets are
+    # parts of the tree, so their own references are replaced where they
+    # are located, i.e. replaced nodes are not walked again
+    kw = Keywords.ref.value
+    if isinstance(tree, JetNode) and kw in tree:
+        return _deref(tree, tree, [])
+
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        for k, v in list(enumerate(node) if isinstance(node, list) else node.items()):
+            if isinstance(v, JetNode) and kw in v:
+                target = _deref(tree, v, [])
+                if isinstance(target, JetNode):
+                    shared.add(id(target))
+                node[k] = target
+            elif isinstance(v, (JetNode, list)):
+                stack.append(v)
+    return tree
+
+
+def _children(
+    node: list | JetNode
+) -> Iterator:
+    return iter(node if isinstance(node, list) else node.values())
+
+
+def _check_cycles(
+    node: Any
+) -> None:
+    # depth first search with an explicit stack, a container met again
+    # while it is being walked is reachable from itself
+    kinds = (list, JetNode)
+    if not isinstance(node, kinds):
+        return
+
+    active, done = {id(node)}, set()
+    stack = [(node, _children(node))]
+    while stack:
+        node, children = stack[-1]
+        for v in children:
+            if not isinstance(v, kinds) or id(v) in done:
+                continue
+            if id(v) in active:
+                raise RuntimeError("Circular references have been detected. "
+                                   "Referenced node contains its own reference.")
+            active.add(id(v))
+            stack.append((v, _children(v)))
+            break
+        else:
+            stack.pop()
+            active.remove(id(node))
+            done.add(id(node))
+
+
+def _link(
+    node: JetNode
+) -> tuple[JetNode, set[int]]:
+    # replaces reference nodes with the referenced ones, so every referrer
+    # points to the same node object. returns ids of shared nodes.
+    if not _has_refs(node):
+        return node, set()
+
+    # references are replaced in a copy, the source tree stays untouched
+    tree, shared = _copy(node), set()
+    tree = _replace_refs(tree, shared)
+    _check_cycles(tree)
+
+    return tree, shared
+
+
+# marks shared nodes that are not built yet
+_EMPTY = object()
+
+
+def _paths(
+    node: Any
+) -> dict[int, tuple]:
+    # tree paths of nodes reported to profiling listeners,
+    # shared nodes are reported by their first path
+    paths: dict[int, tuple] = dict()
+    for path, value in walk(node, (JetNode, list)):
+        if isinstance(value, JetNode):
+            paths.setdefault(id(value), path)
+    return paths
+
+
+def _build(
+    node: Any,
+    partial: bool,
+    shared: dict[int, Any],
+    cache: MutableMapping | None = None
+) -> Any:
+    paths = _paths(node) if LISTENERS else None
+
+    def enter(child: Any) -> Any:
+        # shared nodes are built once per build call
+        value = shared.get(id(child), _EMPTY)
+        return DESCEND if value is _EMPTY else value
+
+    def leave(child: JetNode, children: dict) -> Any:
+        path = paths.get(id(child), ()) if paths is not None else ()
+        # children are built already, so do not convert them recursively
+        value = _build_one(JetNode(children, recursive=False), partial, cache, path)
+        if id(child) in shared:
+            shared[id(child)] = value
+        return value
+
+    return transform(node, (JetNode, list), leave, enter=enter if shared else None)
+
+
+class _Task:
+    # builder node of a parallel build: referrer slots, kwargs, height
+    # and the tree path reported to profiling listeners
+    __slots__ = ("slots", "kwargs", "height", "path")
+
+    def __init__(
+        self,
+        kwargs: JetNode,
+        height: int,
+        path: tuple = tuple()
+    ) -> None:
+        self.slots: list[tuple[Any, Any]] = []
+        self.kwargs = kwargs
+        self.height = height
+        self.path = path
+
+
+def _schedule(
+    node: Any,
+    shared: set[int]
+) -> tuple[Any, list[_Task]]:
+    # copies the tree and collects builder nodes as tasks, builder nodes
+    # are replaced with their tasks until they are built. height of a
+    # subtree is the longest chain of nested builder nodes in it,
+    # -1 for subtrees without builders.
+    tasks: list[_Task] = []
+    heights: dict[int, int] = dict()
+    seen: dict[int, Any] = dict()
+    paths = _paths(node) if LISTENERS else None
+
+    def enter(child: Any) -> Any:
+        # shared node is scheduled already, just add one more referrer
+        return seen.get(id(child), DESCEND)
+
+    def leave(child: JetNode | list, children: dict | list) -> Any:
+        if isinstance(child, list):
+            out, items = children, enumerate(children)
+        else:
+            out = JetNode(children, recursive=False)
+            items = children.items()
+
+        height = -1
+        for key, value in items:
+            if isinstance(value, _Task):
+                value.slots.append((out, key))
+                height = max(height, value.height)
+            elif isinstance(value, (JetNode, list)):
+                height = max(height, heights.get(id(value), -1))
+
+        if isinstance(out, JetNode) and _resolve_builder(out) is not None:
+            # builder is ready when all nested builders are done
+            path = paths.get(id(child), ()) if paths is not None else ()
+            out = _Task(out, height + 1, path)
+            tasks.append(out)
+        else:
+            heights[id(out)] = height
+
+        if id(child) in shared:
+            seen[id(child)] = out
+        return out
+
+    root = [transform(node, (JetNode, list), leave, leave, enter)]
+    if isinstance(root[0], _Task):
+        root[0].slots.append((root, 0))
+    return root, tasks
+
+
+def _build_parallel(
+    node: JetNode,
+    partial: bool,
+    executor: Executor,
+    shared: set[int],
+    cache: MutableMapping | None = None
+) -> Any:
+    root, tasks = _schedule(node, shared)
+
+    # builders of the same height are independent, so they are built
+    # concurrently in waves from the deepest ones to the root.
+    # sorting is stable, so every wave keeps the tree traversal order.
+    tasks = sorted(tasks, key=lambda task: task.height)
+    for _, wave in groupby(tasks, key=lambda task: task.height):
+        wave = list(wave)
+        futures = [
+            executor.submit(_build_one, task.kwargs, partial, cache, task.path)
+            for task in wave
+        ]
+        wait(futures)
+        # results are collected in traversal order, so the reported error
+        # does not depend on timings of concurrent builders
+        for task, future in zip(wave, futures):
+            value = future.result()
+            for parent, key in task.slots:
+                parent[key] = value
+
+    return root[0]
+
+
 def build(
     node: JetNode,
     recursive: bool = True,
-    partial: bool = True
+    partial: bool = True,
+    executor: Executor | None = None,
+    cache: MutableMapping | bool | None = None
 ) -> JetNode:
-    if recursive:
-        node = _build_node(node, partial)
+    # cache=True uses the default BUILD_CACHE, any mapping may be given
+    cache = _get_cache(cache)
+    if not recursive:
+        return _build_one(node, partial, cache)
+
+    # nodes with several referrers are built once
+    node, shared = _link(node)
 
+    if executor is not None:
+        return _build_parallel(node, partial, executor, shared, cache)
+
+    return _build(node, partial, dict.fromkeys(shared, _EMPTY), cache)
+
+
+async def _abuild_one(
+    node: JetNode,
+    partial: bool,
+    cache: MutableMapping | None = None,
+    path: tuple = tuple()
+) -> Any:
     builder = _resolve_builder(node)
 
     if builder is not None:
-        factory = _import_from_string(node.pop(builder))
-        return BUILDERS[builder](factory, kwargs=node, partial=partial)
+        start = _start() if LISTENERS else None
+        factory, kwargs = _split_builder(node, builder)
+
+        key = _cached_key(node, builder, kwargs, partial, cache)
+        if key is not None:
+            try:
+                return cache[key][0]
+            except KeyError:
+                pass
+
+        # coroutine factories and async builders return awaitables
+        result = BUILDERS[builder](factory, kwargs=kwargs, partial=partial)
+        if inspect.isawaitable(result):
+            try:
+                result = await result
+            except Exception as e:
+                raise ValueError(f"Can't build callable {factory}. {e}")
+
+        if key is not None:
+            cache[key] = (result, kwargs)
+        if start is not None:
+            _emit("build", node[builder], path, start)
+        return result
 
     return node
+
+
+async def _abuild_node(
+    node: JetNode,
+    partial: bool,
+    shared: dict[int, Any],
+    cache: MutableMapping | None = None,
+    paths: dict[int, tuple] | None = None
+) -> Any:
+    # sibling subtrees are built concurrently
+    values = await gather(*(_abuild(v, partial, shared, cache, paths) for v in node.values()))
+    path = paths.get(id(node), ()) if paths is not None else ()
+    node = JetNode(dict(zip(node.keys(), values)), recursive=False)
+    return await _abuild_one(node, partial, cache, path)
+
+
+async def _abuild(
+    node: Any,
+    partial: bool,
+    shared: dict[int, Any],
+    cache: MutableMapping | None = None,
+    paths: dict[int, tuple] | None = None
+) -> Any:
+    if isinstance(node, list):
+        return list(await gather(*(_abuild(v, partial, shared, cache, paths) for v in node)))
+
+    if isinstance(node, JetNode):
+        if id(node) not in shared:
+            return await _abuild_node(node, partial, shared, cache, paths)
+        # every referrer awaits the same task of a shared node
+        if shared[id(node)] is _EMPTY:
+            shared[id(node)] = ensure_future(_abuild_node(node, partial, shared, cache, paths))
+        return await shared[id(node)]
+
+    return node
+
+
+async def abuild(
+    node: JetNode,
+    recursive: bool = True,
+    partial: bool = True,
+    cache: MutableMapping | bool | None = None
+) -> JetNode:
+    cache = _get_cache(cache)
+    if not recursive:
+        return await _abuild_one(node, partial, cache)
+
+    # nodes with several referrers are built once
+    node, shared = _link(node)
+    paths = _paths(node) if LISTENERS else None
+    return await _abuild(node, partial, dict.fromkeys(shared, _EMPTY), cache, paths)
@@ -2,8 +2,9 @@ import inspect
 from typing import Any, Callable
 from dataclasses import is_dataclass, fields
 
-from jetcon.node import JetNode
+from jetcon.node import JetNode, _copy
 from jetcon.keywords import Keywords
+from jetcon.walk import transform
 from jetcon.build import (
     build_dataclass,
     build_callable,
@@ -15,10 +16,11 @@ def cast(
     factory: Callable,
     pop_keywords: bool = True
 ) -> Any:
-
-    if pop_keywords:
-        for word in Keywords:
-            node.pop(word.value, None)
+    # factory may keep and modify its arguments, so containers are copied,
+    # but the source tree itself is never modified
+    skip = {word.value for word in Keywords} if pop_keywords else set()
+    node = JetNode({k: _copy(v) for k, v in node.items() if k not in skip},
+                   recursive=False)
 
     if inspect.isclass(factory) and is_dataclass(factory):
         for field in fields(factory):
@@ -43,35 +45,12 @@ def cast(
     raise ValueError(f"Factory is not recognized {factory.__name__}.")
 
 
-def _cast_node_to_dict(
-    dct: dict
-) -> dict:
-    return {k: _to_dict(v) for k, v in dct.items()}
-
-
-def _cast_list_to_dict(
-    lst: list
-) -> list:
-    return [_to_dict(v) for v in lst]
-
-
-def _to_dict(
-    node: Any
-) -> Any:
-    if isinstance(node, list):
-        return _cast_list_to_dict(node)
-
-    if isinstance(node, JetNode):
-        return to_dict(node)
-
-    return node
-
-
 def to_dict(
     node: JetNode,
     recursive: bool = True
 ) -> dict:
     if recursive:
-        return _cast_node_to_dict(node)
+        # nodes are transformed to new dicts, lists to new lists
+        return transform(node, (JetNode, list))
 
     return cast(node, factory=dict, pop_keywords=False)
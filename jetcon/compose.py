@@ -1,10 +1,15 @@
+import yaml     # type: ignore
+from pathlib import Path
 from typing import Any
+from concurrent.futures import Executor, wait, FIRST_COMPLETED
 
 from jetcon.node import JetNode
 from jetcon.context import JetContext
 from jetcon.keywords import Keywords
 from jetcon.merge import merge
-from jetcon.read import read
+from jetcon.walk import transform, containers
+from jetcon.profile import LISTENERS, _start, _emit
+from jetcon.read import read, _load, READERS, COMPOSED_READERS
 
 
 def _parse_imports(
@@ -29,42 +34,102 @@ def _parse_imports(
     return _spec.get(0), _spec.get(1, None)
 
 
-OFFSET = 0
+def _find_imports(
+    node: Any
+) -> list[str]:
+    # imports may be declared in any section, not only at the top
+    kw = Keywords.imports.value
+    specs: list[str] = list()
+    for container in containers(node, (JetNode, list)):
+        if isinstance(container, JetNode) and kw in container:
+            value = container[kw]
+            specs.extend(s for s in ([value] if isinstance(value, str) else value)
+                         if isinstance(s, str))
+    return specs
+
+
+def _prefetch_file(
+    path: Path
+) -> list[Path]:
+    ext = path.suffix.lower()
+    if ext not in READERS or ext in COMPOSED_READERS:
+        return []
+
+    imports = list()
+    for spec in _find_imports(_load(path, READERS[ext])):
+        try:
+            imports.append((path.parent / _parse_imports(spec)[0]).resolve())
+        except RuntimeError:
+            # malformed specs are reported by the sequential read
+            continue
+    return imports
+
+
+def prefetch(
+    path: Path,
+    executor: Executor
+) -> None:
+    """
+    Parses a config and every config it imports concurrently.
+
+    Parameters
+    ----------
+    path : Path
+        The resolved path of the root config.
+    executor : Executor
+        The executor to parse files with.
+
+    Returns
+    -------
+    None
+        Parsed trees are stored in the parse cache. Imports of a file are
+        submitted as soon as it is parsed, so the wait time is bounded by
+        the depth of the import graph rather than the number of files.
+    """
+    seen = {path}
+    pending = {executor.submit(_prefetch_file, path)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                imports = future.result()
+            except (OSError, ValueError, yaml.YAMLError):
+                # missing and broken files are reported by the sequential read,
+                # other errors are not related to the files and are raised
+                continue
+            for child in imports:
+                if child not in seen:
+                    seen.add(child)
+                    pending.add(executor.submit(_prefetch_file, child))
+
 
 def _compose_imports(
     node: JetNode,
     specs: list[str],
 ) -> JetNode:
-    global OFFSET
-
     # empty node to write to
     _node = None# JetNode({})
 
     if isinstance(specs, str):
         specs = [specs]
 
-    OFFSET += 4
-
     for spec in specs:
         # parse path and tag
         path, tag = _parse_imports(spec)
         # resolve path relative to current parent
         path = JetContext._resolve_path(path)
 
-        # print(' '*(OFFSET-4) + 'Import spec: "{}". Resolved path: "{}"'.format(spec, path))
-
         # this if statement check circular import
-        if JetContext._is_visited(str(path)):
+        if JetContext._is_visited(path):
             raise RuntimeError("Circular imports have been detected. "
                                f"The following config has import conflict: {path}")
+        JetContext._add_import(path, tag)
 
-        # add to file to visited stack for inner imports
-        JetContext._add_visit(path)
-        # read and compose inner configs
-        new_node = read(path, compose=True)
-        # remove path from visited stack, since
+        # read and compose inner configs, read adds the file to visited
+        # ones for inner imports and removes it afterwards, since
         # we may want to import the same file in different tree node
-        JetContext._rm_visit(path)
+        start = _start() if LISTENERS else None
+        new_node = read(path, compose=True)
 
         # if tagged import -> use it as key
         if tag is not None:
@@ -82,9 +147,9 @@ def _compose_imports(
         else:
             merge(_node, new_node)
 
-    OFFSET -= 4
-
             # node.update(**new_node)
+        if start is not None:
+            _emit("import", path if tag is None else f"{path} @ {tag}", (), start)
     # revert context parameters from parent node
     # parent node parameters have higher priority
     if len(node) == 0 and isinstance(_node, list):
@@ -95,28 +160,13 @@ def _compose_imports(
 
 def _compose_node(
     node: JetNode,
-    recursive: bool = True
-) -> dict:
-    return JetNode({k: _compose(v, recursive) for k, v in node.items()})
-
-
-def _compose_list(
-    lst: list,
-    recursive: bool = True
-) -> list:
-    return [_compose(v, recursive) for v in lst]
-
-
-def _compose(
-    node: Any,
-    recursive: bool = True
+    children: dict
 ) -> Any:
-    if isinstance(node, list):
-        return _compose_list(node, recursive)
-
-    if isinstance(node, JetNode):
-        return compose(node, recursive)
-
+    # children are composed already, so imports are resolved bottom up
+    node = JetNode(children, recursive=False)
+    kw = Keywords.imports.value
+    if kw in node:
+        return _compose_imports(specs=node.pop(kw), node=node)
     return node
 
 
@@ -125,7 +175,8 @@ def compose(
     recursive: bool = True
 ) -> JetNode:
     if recursive:
-        node = _compose_node(node, recursive)
+        # every container is rebuilt, the source tree stays untouched
+        return transform(node, (JetNode, list), _compose_node)
 
     kw = Keywords.imports.value
 
@@ -1,13 +1,17 @@
 
 from typing import Callable, Any
-from copy import deepcopy
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
 
 from jetcon.node import JetNode
-from jetcon.build import build
+from jetcon.build import build, abuild
+from jetcon.lazy import lazy_build
 from jetcon.cast import cast, to_dict
 from jetcon.read import read
 from jetcon.merge import merge
+from jetcon.override import override
 from jetcon.save import save
+from jetcon.watch import watch, Watcher
 
 
 # yet another interface for interacting with nodes
@@ -17,28 +21,54 @@ class JetConfig:
                            "Use .from_*() methods to create config tree.")
 
     @staticmethod
-    def read(path: str) -> JetNode:
-        return read(path, compose=True)
+    def read(
+        path: str,
+        workers: int | None = None,
+        cache_dir: str | None = None
+    ) -> JetNode:
+        return read(path, compose=True, workers=workers, cache_dir=cache_dir)
 
     @staticmethod
     def build(
         cfg: JetNode,
-        partial: bool = True
+        partial: bool = True,
+        workers: int | None = None,
+        lazy: bool = False,
+        cache: MutableMapping | bool | None = None
+    ) -> JetNode:
+        if lazy:
+            if workers is not None:
+                raise ValueError("Lazy build cannot be combined with workers.")
+            return lazy_build(cfg, partial=partial, cache=cache)
+
+        if workers is None:
+            return build(cfg, recursive=True, partial=partial, cache=cache)
+
+        # independent subtrees are built concurrently
+        with ThreadPoolExecutor(workers) as executor:
+            return build(cfg, recursive=True, partial=partial, executor=executor,
+                         cache=cache)
+
+    @staticmethod
+    async def abuild(
+        cfg: JetNode,
+        partial: bool = True,
+        cache: MutableMapping | bool | None = None
     ) -> JetNode:
-        return build(deepcopy(cfg), recursive=True, partial=partial)
+        return await abuild(cfg, recursive=True, partial=partial, cache=cache)
 
     @staticmethod
     def cast(
         cfg: JetNode,
         factory: Callable
     ) -> Any:
-        return cast(deepcopy(cfg), factory)
+        return cast(cfg, factory)
 
     @staticmethod
     def to_dict(
         cfg: JetNode
     ) -> dict:
-        return to_dict(deepcopy(cfg), recursive=True)
+        return to_dict(cfg, recursive=True)
 
     @staticmethod
     def merge(
@@ -47,9 +77,24 @@ class JetConfig:
     ) -> JetNode:
         return merge(dst, src)
 
+    @staticmethod
+    def override(
+        cfg: JetNode,
+        overrides: dict[str, Any]
+    ) -> JetNode:
+        return override(cfg, overrides)
+
     @staticmethod
     def save(
         cfg: JetNode,
         path: str
     ) -> None:
         return save(cfg, path=path)
+
+    @staticmethod
+    def watch(
+        path: str,
+        callback: Callable[[JetNode, Any], Any],
+        interval: float = 1.0
+    ) -> Watcher:
+        return watch(path, callback, interval=interval)
@@ -1,46 +1,89 @@
-import os
+from typing import Any
 from pathlib import Path
-from warnings import warn
+from contextvars import ContextVar, Token
 
+from jetcon.graph import ImportGraph
 
-class JetContext:
-    # default directory that is used for path resolver during import
-    # PARENT_FOLDER: Path = Path(os.getcwd())
-    # global dependency stack that tracks visited files during import
-    visit_stack: list[Path] = list()
+
+class _State:
+    # state of a single top level read call
+    __slots__ = ("stack", "visited", "graph", "memo")
 
+    def __init__(self) -> None:
+        # files being read, the last one resolves relative imports
+        self.stack: list[Path] = list()
+        # the same files as a set for circular import checks
+        self.visited: set[Path] = set()
+        # files read during the call and imports between them
+        self.graph = ImportGraph()
+        # composed trees of files, see jetcon.watch.ComposeMemo
+        self.memo: Any = None
+
+
+# Every thread and asyncio task gets its own read state, so configs
+# can be read concurrently. Nested read calls share the state of the
+# top level one.
+STATE: ContextVar[_State | None] = ContextVar("jetcon_read_state", default=None)
+
+
+class JetContext:
     def __init__(self) -> None:
         raise RuntimeError(f"Context class {JetContext.__name__} cannot be instantiated")
 
-    # @staticmethod
-    # def _set_resolver(path: Path) -> None:
-    #     if not path.is_absolute():
-    #         _path = path.resolve()
-    #         warn(f"Resolve path is not absolute: {path}. "
-    #              f"Inferring abspath from working directory: {_path}")
-    #         path = _path
-    #     JetContext.PARENT_FOLDER = path
-    #
-    # @staticmethod
-    # def _get_resolver() -> Path:
-    #     return JetContext.PARENT_FOLDER
-    #
-    # @staticmethod
-    # def _reset_resolver() -> None:
-    #     JetContext.PARENT_FOLDER = Path(os.getcwd())
+    @staticmethod
+    def _state() -> _State:
+        state = STATE.get()
+        if state is None:
+            raise RuntimeError("Import context is used outside of read call.")
+        return state
+
+    @staticmethod
+    def _enter(memo: Any = None) -> Token | None:
+        # returns a token only for top level calls, which own the state
+        if STATE.get() is None:
+            state = _State()
+            state.memo = memo
+            return STATE.set(state)
+        return None
 
     @staticmethod
-    def _resolve_path(path: str | Path):
-        return (JetContext.visit_stack[-1].parent / path).resolve()
+    def _exit(token: Token | None) -> None:
+        if token is not None:
+            STATE.reset(token)
+
+    @staticmethod
+    def _resolve_path(path: str | Path) -> Path:
+        return (JetContext._state().stack[-1].parent / path).resolve()
 
     @staticmethod
     def _add_visit(path: Path) -> None:
-        JetContext.visit_stack.append(path)
+        state = JetContext._state()
+        state.stack.append(path)
+        state.visited.add(path)
 
     @staticmethod
     def _rm_visit(path: Path) -> None:
-        JetContext.visit_stack.remove(path)
+        state = JetContext._state()
+        state.stack.pop()
+        state.visited.discard(path)
+
+    @staticmethod
+    def _is_visited(path: Path) -> bool:
+        return path in JetContext._state().visited
+
+    @staticmethod
+    def _add_source(path: Path, digest: str | None = None) -> None:
+        JetContext._state().graph.add_file(path, digest)
+
+    @staticmethod
+    def _add_import(path: Path, tag: str | None) -> None:
+        state = JetContext._state()
+        state.graph.add_edge(state.stack[-1], path, tag)
+
+    @staticmethod
+    def _memo() -> Any:
+        return JetContext._state().memo
 
     @staticmethod
-    def _is_visited(path: str) -> bool:
-        return str(path) in JetContext.visit_stack
+    def _graph() -> ImportGraph:
+        return JetContext._state().graph
@@ -0,0 +1,106 @@
+from typing import Any, NamedTuple
+
+from jetcon.node import JetNode, _cached_fingerprint
+from jetcon.merge import _index
+
+
+class Diff(NamedTuple):
+    # dotted paths, e.g. "optim.lr" or "layers.0.size"
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def _join(
+    path: str,
+    key: Any
+) -> str:
+    return f"{path}.{key}" if path else str(key)
+
+
+def _nested(
+    a: Any,
+    b: Any
+) -> bool:
+    return (isinstance(a, JetNode) and isinstance(b, JetNode)) \
+        or (isinstance(a, list) and isinstance(b, list))
+
+
+def diff(
+    a: Any,
+    b: Any
+) -> Diff:
+    """
+    Compares two trees.
+
+    Parameters
+    ----------
+    a : JetNode
+        The old tree.
+    b : JetNode
+        The new tree.
+
+    Returns
+    -------
+    Diff
+        Dotted paths added to, removed from and changed in the new tree,
+        in traversal order. Keys are matched by names without "!", a key
+        that gains or loses "!" is reported as changed. Lists are compared
+        by positions, similarly to merge.
+    """
+    result = Diff([], [], [])
+    if a is b:
+        return result
+
+    if not _nested(a, b):
+        if type(a) is not type(b) or a != b:
+            result.changed.append("")
+        return result
+
+    # explicit stack, deep trees do not hit the recursion limit.
+    # only pairs of containers are pushed, leaves are compared in place.
+    stack = [(a, b, "")]
+    while stack:
+        a, b, path = stack.pop()
+        pairs = list()
+
+        if isinstance(a, JetNode):
+            # keys are matched by names as in merge, "model" wins over "model!"
+            ia, ib = _index(a), _index(b)
+            for base, (ka, _) in ia.items():
+                if base not in ib:
+                    result.removed.append(_join(path, base))
+                    continue
+                kb = ib[base][0]
+                if ka != kb:
+                    result.changed.append(_join(path, base))
+                else:
+                    pairs.append((base, a[ka], b[kb]))
+            result.added.extend(_join(path, base) for base in ib if base not in ia)
+        else:
+            pairs.extend((k, va, vb) for k, (va, vb) in enumerate(zip(a, b)))
+            result.removed.extend(_join(path, k) for k in range(len(b), len(a)))
+            result.added.extend(_join(path, k) for k in range(len(a), len(b)))
+
+        nested = list()
+        for key, va, vb in pairs:
+            # identical subtrees are shared by sweeps and overrides
+            if va is vb:
+                continue
+            if isinstance(va, JetNode) and isinstance(vb, JetNode):
+                # fingerprints are never computed here, only reused
+                fa = _cached_fingerprint(va)
+                if fa is not None and fa == _cached_fingerprint(vb):
+                    continue
+            if _nested(va, vb):
+                nested.append((va, vb, _join(path, key)))
+            elif type(va) is not type(vb) or va != vb:
+                result.changed.append(_join(path, key))
+
+        # reversed, so subtrees are popped in traversal order
+        stack.extend(reversed(nested))
+
+    return result
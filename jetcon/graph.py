@@ -0,0 +1,136 @@
+from __future__ import annotations
+import hashlib
+from pathlib import Path
+
+from jetcon.node import JetNode
+
+# Content hashes of files. Files are hashed again only if their
+# (mtime, size) signatures are changed, similarly to the parse cache.
+HASHES: dict[Path, tuple[tuple[int, int], str]] = dict()
+
+
+def file_hash(
+    path: Path
+) -> str:
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = HASHES.get(path, None)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with path.open("rb") as file:
+        digest = hashlib.sha256(file.read()).hexdigest()
+    HASHES[path] = (signature, digest)
+    return digest
+
+
+class ImportGraph:
+    # Import DAG walked by a top level read call. Files are stored with
+    # their content hashes, edges are (importer, imported, tag) triples.
+    def __init__(self) -> None:
+        # files in the order of reading, the root config goes first
+        self.files: dict[Path, str] = dict()
+        self.edges: list[tuple[Path, Path, str | None]] = list()
+
+    @property
+    def root(self) -> Path | None:
+        return next(iter(self.files), None)
+
+    def add_file(
+        self,
+        path: Path,
+        digest: str | None = None
+    ) -> None:
+        if path not in self.files:
+            self.files[path] = file_hash(path) if digest is None else digest
+
+    def add_edge(
+        self,
+        importer: Path,
+        imported: Path,
+        tag: str | None
+    ) -> None:
+        self.edges.append((importer, imported, tag))
+
+    def imports(
+        self,
+        path: Path
+    ) -> list[tuple[Path, str | None]]:
+        # files imported by the given one with their tags
+        return [(dst, tag) for src, dst, tag in self.edges if src == path]
+
+    def importers(
+        self,
+        path: Path
+    ) -> list[Path]:
+        return list(dict.fromkeys(src for src, dst, _ in self.edges if dst == path))
+
+    def closure(
+        self,
+        path: Path
+    ) -> list[Path]:
+        # the file and every file it imports directly or indirectly
+        seen, stack = dict(), [path]
+        while stack:
+            current = stack.pop()
+            if current not in seen:
+                seen[current] = None
+                stack.extend(dst for dst, _ in reversed(self.imports(current)))
+        return list(seen)
+
+    def digest(self) -> str:
+        # hash of the whole closure, it changes if any file is changed
+        # or if imports are rearranged
+        h = hashlib.sha256()
+        for path, digest in self.files.items():
+            h.update(f"{path}\0{digest}\n".encode())
+        for src, dst, tag in self.edges:
+            h.update(f"{src}\0{dst}\0{tag}\n".encode())
+        return h.hexdigest()
+
+    def is_stale(self) -> bool:
+        for path, digest in self.files.items():
+            if not path.exists() or file_hash(path) != digest:
+                return True
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            "files": {str(p): d for p, d in self.files.items()},
+            "edges": [(str(s), str(d), t) for s, d, t in self.edges],
+        }
+
+    @staticmethod
+    def from_dict(
+        data: dict
+    ) -> ImportGraph:
+        graph = ImportGraph()
+        for path, digest in data["files"].items():
+            graph.add_file(Path(path), digest)
+        for src, dst, tag in data["edges"]:
+            graph.add_edge(Path(src), Path(dst), tag)
+        return graph
+
+    def __repr__(self) -> str:
+        return f"ImportGraph(root={self.root}, files={len(self.files)}, edges={len(self.edges)})"
+
+
+def import_graph(
+    node: JetNode
+) -> ImportGraph | None:
+    """
+    Returns the import graph of a tree.
+
+    Parameters
+    ----------
+    node : JetNode
+        The tree returned by a top level read call.
+
+    Returns
+    -------
+    ImportGraph | None
+        Files read to produce the tree with their content hashes and
+        imports between them. None for trees that were not produced by read.
+    """
+    return vars(node).get("__graph__", None)
@@ -1,8 +1,11 @@
 import re
+import weakref
 from typing import Any
-from functools import reduce
+from collections import deque
 
-from jetcon.node import JetNode
+from jetcon.node import JetNode, _copy, _track
+from jetcon.walk import walk
+from jetcon.profile import LISTENERS, _start, _emit
 
 # Define match pattern for looking for values in strings
 # This patterns corresponds to "${this.value}" string
@@ -14,32 +17,236 @@ LERP_PATTERN = re.compile("\$\{{1}[a-z]+[a-z0-9._]+\}{1}", re.IGNORECASE)
 EXTRACT_PATTERN = re.compile("[a-z0-9_]+", re.IGNORECASE)
 
 
+class Plan:
+    # Compiled interpolation of a tree. Slots are strings with references,
+    # each slot is addressed by its path, i.e. a tuple of keys from root.
+    # Slots are evaluated in dependency order, so references to other
+    # interpolated values get resolved values instead of templates.
+    # Plans are never modified, so they can be shared between trees.
+    __slots__ = ("slots", "order", "rank", "under", "dependents",
+                 "referrers", "referrers_under")
+
+    def __init__(
+        self,
+        slots: dict[tuple, tuple[str, list[tuple[str, tuple]]]]
+    ) -> None:
+        # path -> (template, [(match, reference path), ...])
+        self.slots = slots
+        # path prefix -> paths of slots under it
+        self.under = _prefixes(slots)
+        # path -> paths of slots that depend on its value
+        self.dependents = _dependencies(slots, self.under)
+        # slot paths in topological order
+        self.order = _sort(slots, self.dependents)
+        self.rank = {path: i for i, path in enumerate(self.order)}
+        # reverse indices used to find slots affected by changed paths:
+        # reference path -> slots, reference path prefix -> slots
+        self.referrers: dict[tuple, list[tuple]] = dict()
+        self.referrers_under: dict[tuple, list[tuple]] = dict()
+        for path, (_, refs) in slots.items():
+            for _, ref in refs:
+                self.referrers.setdefault(ref, []).append(path)
+                for i in range(1, len(ref) + 1):
+                    self.referrers_under.setdefault(ref[:i], []).append(path)
+
+
 def find_matches(
     value: str
 ) -> list[str]:
     return re.findall(LERP_PATTERN, value)
 
 
+def _find(
+    tree: JetNode,
+    path: tuple
+) -> Any:
+    value = tree
+    for key in path:
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and isinstance(key, int) and key < len(value):
+            # slot paths contain indices of list items
+            value = value[key]
+        else:
+            return None
+    return value
+
+
 def find_value(
     tree: JetNode,
     value: str,
 ) -> Any:
-    return reduce(dict.get, re.findall(EXTRACT_PATTERN, value), tree)
+    return _find(tree, tuple(re.findall(EXTRACT_PATTERN, value)))
+
+
+def _collect(
+    node: Any,
+    path: tuple,
+    slots: dict[tuple, tuple[str, list[tuple[str, tuple]]]],
+    root: weakref.ref | None = None
+) -> None:
+    for _path, value in walk(node, (JetNode, list), path):
+        # cheap check first, most strings contain no references
+        if isinstance(value, str):
+            if "${" in value:
+                # the same reference may be used several times in a string
+                matches = list(dict.fromkeys(find_matches(value)))
+                if matches:
+                    refs = [(m, tuple(re.findall(EXTRACT_PATTERN, m))) for m in matches]
+                    slots[_path] = (value, refs)
+        elif root is not None and isinstance(value, JetNode):
+            # nodes are linked to the root in the same pass, see set_plan
+            vars(value)["__root__"] = root
+
+
+def _prefixes(
+    slots: dict[tuple, tuple[str, list[tuple[str, tuple]]]]
+) -> dict[tuple, list[tuple]]:
+    # maps every prefix of slot paths to slots under it
+    under: dict[tuple, list[tuple]] = dict()
+    for path in slots:
+        for i in range(1, len(path) + 1):
+            under.setdefault(path[:i], []).append(path)
+    return under
+
+
+def _dependencies(
+    slots: dict[tuple, tuple[str, list[tuple[str, tuple]]]],
+    under: dict[tuple, list[tuple]]
+) -> dict[tuple, list[tuple]]:
+    dependents: dict[tuple, list[tuple]] = {path: [] for path in slots}
+    for path, (_, refs) in slots.items():
+        deps = dict()
+        for _, ref in refs:
+            # referenced value contains interpolated strings
+            deps.update(dict.fromkeys(under.get(ref, [])))
+            # referenced value is reached through an interpolated string
+            deps.update(dict.fromkeys(ref[:i] for i in range(1, len(ref))
+                                      if ref[:i] in slots))
+        for dep in deps:
+            dependents[dep].append(path)
+
+    return dependents
+
+
+def _sort(
+    slots: dict[tuple, tuple[str, list[tuple[str, tuple]]]],
+    dependents: dict[tuple, list[tuple]]
+) -> list[tuple]:
+    # Kahn's algorithm, ties are resolved in tree traversal order
+    degree = dict.fromkeys(slots, 0)
+    for paths in dependents.values():
+        for path in paths:
+            degree[path] += 1
+
+    queue = deque(path for path in slots if degree[path] == 0)
+    order = list()
+    while queue:
+        path = queue.popleft()
+        order.append(path)
+        for dependent in dependents[path]:
+            degree[dependent] -= 1
+            if degree[dependent] == 0:
+                queue.append(dependent)
+
+    if len(order) < len(slots):
+        cycle = [".".join(map(str, p)) for p in slots if degree[p] > 0]
+        raise RuntimeError("Circular interpolation has been detected. "
+                           f"Unresolved values: {cycle}.")
+    return order
+
+
+def compile_plan(
+    tree: JetNode
+) -> Plan:
+    """
+    Collects references of a tree into a dependency ordered plan.
+
+    Parameters
+    ----------
+    tree : JetNode
+        The tree to interpolate.
+
+    Returns
+    -------
+    Plan
+        The plan to evaluate with evaluate function.
+    """
+    slots: dict[tuple, tuple[str, list[tuple[str, tuple]]]] = dict()
+    _collect(tree, tuple(), slots, _ref(tree))
+    return Plan(slots)
+
+
+def update_plan(
+    plan: Plan,
+    tree: JetNode,
+    changed: list[tuple]
+) -> tuple[Plan, list[tuple]]:
+    """
+    Updates a plan after values at changed paths were overwritten.
+
+    Parameters
+    ----------
+    plan : Plan
+        The plan of the tree before changes.
+    tree : JetNode
+        The changed tree.
+    changed : list[tuple]
+        Paths of overwritten values.
+
+    Returns
+    -------
+    tuple[Plan, list[tuple]]
+        The plan of the changed tree and paths of slots to evaluate again
+        in dependency order. The original plan is not modified.
+    """
+    dropped, added = dict(), dict()
+    affected = dict()
+    for path in changed:
+        # slots under changed values and slots replaced by changed values
+        dropped.update(dict.fromkeys(plan.under.get(path, [])))
+        dropped.update(dict.fromkeys(path[:i] for i in range(1, len(path))
+                                     if path[:i] in plan.slots))
+        # changed values may contain new references
+        _collect(_find(tree, path), path, added, _ref(tree))
+        # slots referencing changed values, their parents or children
+        affected.update(dict.fromkeys(plan.referrers_under.get(path, [])))
+        for i in range(1, len(path)):
+            affected.update(dict.fromkeys(plan.referrers.get(path[:i], [])))
+
+    if dropped or added:
+        slots = {p: v for p, v in plan.slots.items() if p not in dropped}
+        slots.update(added)
+        plan = Plan(slots)
+
+    # values of dependent slots are changed as well
+    queue = [p for p in affected if p in plan.slots] + list(added)
+    affected = dict.fromkeys(queue)
+    while queue:
+        for dependent in plan.dependents[queue.pop()]:
+            if dependent not in affected:
+                affected[dependent] = None
+                queue.append(dependent)
+
+    return plan, sorted(affected, key=plan.rank.__getitem__)
 
 
 def _interpolate_string(
     value: str,
-    tree: JetNode
+    refs: list[tuple[str, tuple]],
+    tree: JetNode,
+    memo: dict[tuple, Any]
 ) -> Any:
-    matches = find_matches(value)
+    for _m, ref in refs:
+        if ref not in memo:
+            memo[ref] = _find(tree, ref)
+        _v = memo[ref]
 
-    values = [find_value(tree, m) for m in matches]
-    # replace matches to string casted values
-    for _m, _v in zip(matches, values):
         if not value.replace(_m, ""):
             # this case correspond to a single match
-            # so just replace the whole value
-            value = _v
+            # so just replace the whole value. subtrees are copied,
+            # since trees are merged in place later.
+            value = _copy(_v)
         else:
             # this is the multiple matche case
             # replace every match with string cased value
@@ -48,37 +255,119 @@ def _interpolate_string(
     return value
 
 
-def _interpolate_node(
-    node: JetNode,
+def _assign(
     tree: JetNode,
-) -> JetNode:
-    return JetNode({k: _interpolate(v, tree) for k, v in node.items()})
+    path: tuple,
+    value: Any
+) -> None:
+    node = tree
+    for key in path[:-1]:
+        node = node[key]
+    node[path[-1]] = value
 
 
-def _interpolate_list(
-    lst: list,
+def evaluate(
     tree: JetNode,
-) -> list:
-    return [_interpolate(v, tree) for v in lst]
+    plan: Plan,
+    paths: list[tuple] | None = None
+) -> JetNode:
+    """
+    Resolves references of a compiled plan in place.
 
+    Parameters
+    ----------
+    tree : JetNode
+        The tree the plan was compiled for.
+    plan : Plan
+        The compiled plan.
+    paths : list[tuple] | None
+        Slots to evaluate in dependency order. If None, all slots are
+        evaluated.
 
-def _interpolate(
-    node: Any,
+    Returns
+    -------
+    JetNode
+        The interpolated tree.
+    """
+    # every referenced path is resolved once, dependency order guarantees
+    # that referenced values are final when they are resolved
+    memo: dict[tuple, Any] = dict()
+    root = _ref(tree)
+    profiled = bool(LISTENERS)
+    for path in (plan.order if paths is None else paths):
+        start = _start() if profiled else None
+        template, refs = plan.slots[path]
+        value = _interpolate_string(template, refs, tree, memo)
+        if root is not None and isinstance(value, (JetNode, list)):
+            # copied subtrees are linked to the root, see set_plan
+            _track(tree, value)
+        _assign(tree, path, value)
+        if start is not None:
+            _emit("interpolate", template, path, start)
+
+    return tree
+
+
+def get_plan(
+    tree: JetNode
+) -> Plan | None:
+    # plan of the last interpolation, it allows to update interpolated
+    # values incrementally when the tree is overridden
+    return vars(tree).get("__plan__", None)
+
+
+def _ref(
+    tree: Any
+) -> weakref.ref | None:
+    return weakref.ref(tree) if isinstance(tree, JetNode) else None
+
+
+def set_plan(
     tree: JetNode,
-) -> Any:
-    if isinstance(node, list):
-        return _interpolate_list(node, tree)
+    plan: Plan
+) -> None:
+    # attaches the plan. nodes linked to the root record their mutations
+    # while it holds a plan, see mutations. compile_plan, update_plan and
+    # evaluate link the nodes they visit or create, trees interpolated
+    # otherwise are linked with _track.
+    vars(tree).pop("__mutations__", None)
+    vars(tree)["__plan__"] = plan
+
 
-    if isinstance(node, JetNode):
-        return _interpolate_node(node, tree)
+def mutations(
+    tree: JetNode
+) -> list[tuple]:
+    # paths changed outside of override since the plan was attached, e.g.
+    # by merge or by assignments, in-place changes of lists are not tracked.
+    # paths of mutated nodes are found by a single walk, detached ones are
+    # skipped. recorded mutations are cleared.
+    recorded = vars(tree).pop("__mutations__", None)
+    if not recorded:
+        return []
 
-    if isinstance(node, str):
-        return _interpolate_string(node, tree)
+    keys: dict[int, list] = dict()
+    for (_, key), node in recorded.items():
+        keys.setdefault(id(node), []).append(key)
 
-    return node
+    paths = list()
+    for path, value in walk(tree, (JetNode, list)):
+        # recorded nodes are alive, so their ids are not reused
+        if id(value) in keys:
+            paths.extend(path + (key,) for key in keys[id(value)])
+    return paths
 
 
 def interpolate(
-    tree: JetNode
+    tree: JetNode,
+    inplace: bool = False
 ) -> JetNode:
-    return _interpolate_node(tree, tree)
+    # interpolate a copy, the source tree stays untouched,
+    # unless the tree is private to the caller
+    if not inplace:
+        tree = _copy(tree)
+    plan = compile_plan(tree)
+    evaluate(tree, plan)
+
+    if isinstance(tree, JetNode):
+        set_plan(tree, plan)
+    return tree
@@ -8,3 +8,5 @@ class Keywords(Enum):
     type = "_type_"
 
     imports = "_import_"    # import directive
+    ref = "_ref_"   # reference to a node shared within a single build
+    cache = "_cache_"   # set to false to never take a node from build cache
@@ -0,0 +1,200 @@
+from __future__ import annotations
+from typing import Any
+from collections.abc import MutableMapping
+
+from jetcon.node import JetNode
+from jetcon.walk import transform, containers, DESCEND
+from jetcon.build import build, _build, _resolve_builder, _link, _get_cache, _EMPTY
+
+
+class Deferred:
+    # builder subtree that is built on first access and memoized
+    __slots__ = ("node", "partial", "shared", "cache", "value")
+
+    def __init__(
+        self,
+        node: JetNode | list,
+        partial: bool,
+        shared: dict[int, Any],
+        cache: MutableMapping | None = None
+    ) -> None:
+        self.node = node
+        self.partial = partial
+        # shared nodes built by any deferred node of the same tree
+        self.shared = shared
+        self.cache = cache
+        self.value = None
+
+    def get(self) -> Any:
+        if self.node is not None:
+            self.value = _build(self.node, self.partial, self.shared, self.cache)
+            # release the source subtree, it is not needed anymore
+            self.node = None
+        return self.value
+
+    def __repr__(self) -> str:
+        if self.node is None:
+            return repr(self.value)
+        return f"Deferred({self.node!r})"
+
+
+class LazyNode(JetNode):
+    def __init__(
+        self,
+        cfg: dict = {},
+        recursive: bool = False
+    ) -> None:
+        # children are deferred already, never convert them
+        super().__init__(cfg, recursive=False)
+
+    def __getitem__(
+        self,
+        key: Any
+    ) -> Any:
+        value = super().__getitem__(key)
+        if isinstance(value, Deferred):
+            value = value.get()
+            # memoize built value in place of deferred one
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(
+        self,
+        key: Any,
+        default: Any = None
+    ) -> Any:
+        return self[key] if key in self else default
+
+    def _force(self) -> None:
+        for key in self.keys():
+            self[key]
+
+    def values(self):
+        self._force()
+        return super().values()
+
+    def items(self):
+        self._force()
+        return super().items()
+
+    def __iter__(self):
+        # dicts are copied from subclasses with their own iterator via
+        # keys and __getitem__, so dict(node) and **node get built values
+        return super().__iter__()
+
+    def setdefault(
+        self,
+        key: Any,
+        default: Any = None
+    ) -> Any:
+        return self[key] if key in self else super().setdefault(key, default)
+
+    def pop(self, *args: Any) -> Any:
+        if args and args[0] in self:
+            self[args[0]]
+        return super().pop(*args)
+
+    def popitem(self) -> tuple[Any, Any]:
+        if self:
+            # items are popped in LIFO order
+            self[next(reversed(self.keys()))]
+        return super().popitem()
+
+    def copy(self) -> LazyNode:
+        self._force()
+        return LazyNode(self)
+
+    def __eq__(self, other: Any) -> bool:
+        self._force()
+        if isinstance(other, LazyNode):
+            other._force()
+        return super().__eq__(other)
+
+    def __ne__(self, other: Any) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def materialize(self) -> JetNode:
+        # builds every deferred node of the tree in place
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            for key in node.keys():
+                value = node[key]
+                if isinstance(value, LazyNode):
+                    stack.append(value)
+        return self
+
+
+def _has_builder(
+    node: Any
+) -> bool:
+    return any(isinstance(v, JetNode) and _resolve_builder(v) is not None
+               for v in containers(node, (JetNode, list)))
+
+
+def _defer(
+    node: JetNode,
+    partial: bool,
+    shared: dict[int, Any],
+    cache: MutableMapping | None = None
+) -> Any:
+    # shared nodes are deferred once, every referrer gets the same object
+    deferred: dict[int, Any] = dict()
+
+    def enter(child: JetNode) -> Any:
+        if id(child) in deferred:
+            return deferred[id(child)]
+        if _resolve_builder(child) is None:
+            return DESCEND
+        value = Deferred(child, partial, shared, cache)
+        if id(child) in shared:
+            deferred[id(child)] = value
+        return value
+
+    def leave(child: JetNode, children: dict) -> LazyNode:
+        for k, v in children.items():
+            if isinstance(v, list):
+                # lists are deferred as a whole, since they are accessed by index
+                children[k] = Deferred(v, partial, shared, cache) if _has_builder(v) \
+                    else _build(v, partial, shared, cache)
+        value = LazyNode(children)
+        if id(child) in shared:
+            deferred[id(child)] = value
+        return value
+
+    # lists are not descended into, they are handled by their parents
+    return transform(node, (JetNode,), leave, enter=enter)
+
+
+def lazy_build(
+    node: JetNode,
+    partial: bool = True,
+    cache: MutableMapping | bool | None = None
+) -> LazyNode | Any:
+    """
+    Builds a tree lazily. Builder nodes are instantiated on first access.
+
+    Parameters
+    ----------
+    node : JetNode
+        The tree to build.
+    partial : bool
+        Whether builder nodes with missing arguments are built as partials.
+    cache : MutableMapping | bool | None
+        The build cache, True for the default one.
+
+    Returns
+    -------
+    LazyNode | Any
+        The tree, where builder nodes are built on first access and
+        memoized. If the root itself is a builder node, it is built
+        immediately. Use LazyNode.materialize to build everything, e.g.
+        before unpacking the tree with **.
+    """
+    if _resolve_builder(node) is not None:
+        return build(node, recursive=True, partial=partial, cache=cache)
+
+    # nodes with several referrers are built once
+    node, shared = _link(node)
+    return _defer(node, partial, dict.fromkeys(shared, _EMPTY), _get_cache(cache))
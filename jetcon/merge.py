@@ -1,64 +1,45 @@
-import re
 from typing import Any
+from functools import lru_cache
 
 from jetcon.node import JetNode
 
 
 ESCAPE_CHAR = "!"
 
-# usefull to extract string name without '!'
-EXTRACT_PATTERN = re.compile("[a-z0-9_]+", re.IGNORECASE)
 
-# usefull to check if section is mergable
-MERGABLE_PATTERN = re.compile("[a-z0-9_]+!", re.IGNORECASE)
-
-# usefull to check syntax
-SYNTAX_PATTERN = re.compile("[a-z0-9_]+!?", re.IGNORECASE)
-
-
-def _mergable(
+@lru_cache(maxsize=65536)
+def _parse_key(
     key: str
-) -> None:
-    return not bool(re.fullmatch(MERGABLE_PATTERN, key))   # key[-1] != ESCAPE_CHAR
-
-
-def _get(
-    key: str,
-    node: JetNode
-) -> Any:
-    key = _key(key)
-    if key in node:
-        return node[key], key
-    else:
-        return node[key + ESCAPE_CHAR], key + ESCAPE_CHAR
-
-
-def _key(
-    key: str
-) -> str:
-    if re.fullmatch(SYNTAX_PATTERN, key) is None:
+) -> tuple[str, bool]:
+    # validates syntax once per distinct key, i.e. "[a-z0-9_]+!?".
+    # returns the key name without "!" and whether the section is replaced
+    replace = key.endswith(ESCAPE_CHAR)
+    base = key[:-1] if replace else key
+    if not (base.isascii() and base.replace("_", "a").isalnum()):
         raise SyntaxError(f"Undefinded key syntax: {key}")
-    return re.findall(EXTRACT_PATTERN, key)[0]
+    return base, replace
 
 
-def _keys(
+def _index(
     node: JetNode
-) -> set[str]:
-    return {_key(k) for k in node}
-
-
-def _replace(
-    node: JetNode,
-    key: str,
-    value: Any
-) -> JetNode:
-    if key in node:
-        node[key] = value
-    else:
-        del node[key + ESCAPE_CHAR]
-        node[key] = value
-
-    return node
+) -> dict[Any, tuple[Any, bool]]:
+    # maps key names to (actual key, replace flag) in a single pass.
+    # if both "a" and "a!" are present, "a" wins
+    index = dict()
+    for key in node:
+        base, replace = _parse_key(key) if isinstance(key, str) else (key, False)
+        if base not in index or index[base][1]:
+            index[base] = (key, replace)
+    return index
+
+
+class _Items(dict):
+    # items of a list by index, e.g. {1: {"size": 2}} from the override
+    # "layers.1.size", other items are kept. indices in replace are
+    # replaced instead of merged, as with "!" keys.
+    def __init__(self) -> None:
+        super().__init__()
+        self.replace: set[int] = set()
 
 
 def _merge(
@@ -70,6 +51,11 @@ def _merge(
 
     if isinstance(dst, list) and isinstance(src, list):
         return _merge_lists(dst, src)
+
+    if isinstance(dst, list) and isinstance(src, _Items):
+        for i, value in src.items():
+            dst[i] = value if i in src.replace else _merge(dst[i], value)
+        return dst
     # cannot merge other type, so just replace
     return src
 
@@ -96,20 +82,16 @@ def _merge_nodes(
     dst: JetNode,
     src: JetNode
 ) -> JetNode:
-    # intersection
-    for k in _keys(src) & _keys(dst):
-        sv, sk = _get(k, src)
-        dv, dk = _get(k, dst)
-
-        if _mergable(sk):
-            _replace(dst, dk, _merge(dv, sv))
+    index = _index(dst)
+    for base, (sk, replace) in _index(src).items():
+        sv = src[sk]
+        if base in index:
+            # intersection, dst keeps its own key spelling
+            dk = index[base][0]
+            dst[dk] = sv if replace else _merge(dst[dk], sv)
         else:
-            _replace(dst, dk, sv)
-
-    # difference
-    for k in _keys(src) - _keys(dst):
-        sv, _ = _get(k, src)
-        dst[k] = sv
+            # difference, new keys are added without "!"
+            dst[base] = sv
 
     return dst
 
@@ -119,3 +101,63 @@ def merge(
     src: JetNode
 ) -> JetNode:
     return _merge_nodes(dst, src)
+
+
+def _merge_shared(
+    dst: Any,
+    src: Any,
+    owned: set[int]
+) -> Any:
+    # persistent counterpart of _merge: dst is never modified, containers
+    # on merged paths are copied and every other subtree is shared
+    if isinstance(dst, JetNode) and isinstance(src, JetNode):
+        out = JetNode(dst, recursive=False)
+        index = _index(dst)
+        for base, (sk, replace) in _index(src).items():
+            sv = src[sk]
+            if base in index:
+                dk = index[base][0]
+                out[dk] = sv if replace else _merge_shared(dst[dk], sv, owned)
+            else:
+                out[base] = sv
+
+    elif isinstance(dst, list) and isinstance(src, list):
+        out = [_merge_shared(d, s, owned) for d, s in zip(dst, src)]
+        out.extend(dst[len(src):] or src[len(dst):])
+
+    elif isinstance(dst, list) and isinstance(src, _Items):
+        out = list(dst)
+        for i, value in src.items():
+            out[i] = value if i in src.replace else _merge_shared(dst[i], value, owned)
+
+    else:
+        return src
+
+    owned.add(id(out))
+    return out
+
+
+def merged(
+    dst: JetNode,
+    src: JetNode,
+    owned: set[int] | None = None
+) -> JetNode:
+    """
+    Merges two trees without modifying them.
+
+    Parameters
+    ----------
+    dst : JetNode
+        The base tree.
+    src : JetNode
+        The tree merged into the base one.
+    owned : set[int] | None
+        If given, ids of containers created by the merge are added to it.
+
+    Returns
+    -------
+    JetNode
+        The merged tree. It shares every subtree untouched by src with dst,
+        so modify it in place only along the merged paths.
+    """
+    return _merge_shared(dst, src, set() if owned is None else owned)
@@ -1,7 +1,14 @@
 from __future__ import annotations
+import weakref
+import hashlib
 from adict import adict     # type: ignore
-from copy import deepcopy
-from typing import Any, Callable
+from typing import Any, Callable, Iterable
+
+from jetcon.walk import transform, DESCEND
+
+# Size of fingerprints in bytes, 128 bits are enough to avoid collisions
+# of cache keys, and short digests are cheaper to combine.
+DIGEST_SIZE = 16
 
 
 def _dict_to_node(
@@ -10,22 +17,172 @@ def _dict_to_node(
     return {k: _to_node(v) for k, v in dct.items()}
 
 
-def _list_to_node(
-    lst: list
-) -> list:
-    return [_to_node(v) for v in lst]
+def _rebuild(
+    node: dict,
+    children: dict
+) -> JetNode:
+    # children are converted already, so every container is built once
+    return JetNode(children, recursive=False)
 
 
 def _to_node(
     node: Any
 ) -> Any:
-    if isinstance(node, list):
-        return _list_to_node(node)
+    # nested dicts are converted to nodes, lists are converted to new lists
+    return transform(node, (dict, list), _rebuild)
+
+
+def _copy(
+    node: Any
+) -> Any:
+    # structural copy: containers are copied, leaves are shared.
+    # leaves produced by readers are immutable scalars, so it is
+    # much cheaper than deepcopy and is still safe to mutate.
+    return transform(node, (JetNode, list), _rebuild)
+
+
+def _leaf_digest(
+    value: Any
+) -> bytes:
+    # type tags distinguish values with equal reprs, e.g. 1, 1.0 and "1"
+    if value is None:
+        data = b"n"
+    elif isinstance(value, bool):
+        data = b"b1" if value else b"b0"
+    elif isinstance(value, int):
+        data = b"i" + str(value).encode()
+    elif isinstance(value, float):
+        data = b"f" + value.hex().encode()
+    elif isinstance(value, str):
+        data = b"s" + value.encode()
+    elif isinstance(value, bytes):
+        data = b"y" + value
+    else:
+        # e.g. dates, reprs of other objects must be deterministic
+        kind = type(value)
+        data = f"o{kind.__module__}.{kind.__qualname__}:{value!r}".encode()
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+def _unlink(
+    parents: dict[int, weakref.ref],
+    key: int
+) -> Callable[[weakref.ref], None]:
+    # removes the link of a collected parent, unless it is replaced already
+    def callback(ref: weakref.ref) -> None:
+        if parents.get(key, None) is ref:
+            del parents[key]
+    return callback
+
+
+def _link_parent(
+    node: JetNode,
+    parent: JetNode
+) -> None:
+    # parents are linked lazily, so mutations invalidate their caches
+    parents = vars(node).setdefault("__parents__", {})
+    ref = parents.get(id(parent), None)
+    if ref is None or ref() is not parent:
+        parents[id(parent)] = weakref.ref(parent, _unlink(parents, id(parent)))
+
+
+def _digest(
+    value: Any,
+    transformed: Any
+) -> bytes:
+    # nested containers are transformed to their digests already
+    return transformed if isinstance(value, (JetNode, list)) else _leaf_digest(value)
+
+
+def _node_digest(
+    node: JetNode
+) -> bytes:
+    def enter(child: Any) -> Any:
+        if isinstance(child, JetNode):
+            cached = vars(child).get("__fingerprint__", None)
+            if cached is not None:
+                return cached
+        return DESCEND
+
+    def mapping(child: JetNode, digests: dict) -> bytes:
+        # nodes in lists are linked to the closest node
+        stack = [v for v in child.values() if isinstance(v, (JetNode, list))]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, JetNode):
+                _link_parent(value, child)
+            else:
+                stack.extend(v for v in value if isinstance(v, (JetNode, list)))
+        # entries are sorted, so the digest does not depend on key order
+        entries = sorted(_leaf_digest(k) + _digest(v, digests[k]) for k, v in child.items())
+        digest = hashlib.blake2b(b"d" + b"".join(entries), digest_size=DIGEST_SIZE).digest()
+        vars(child)["__fingerprint__"] = digest
+        return digest
+
+    def sequence(child: list, digests: list) -> bytes:
+        data = b"".join(_digest(v, d) for v, d in zip(child, digests))
+        return hashlib.blake2b(b"l" + data, digest_size=DIGEST_SIZE).digest()
+
+    return transform(node, (JetNode, list), mapping, sequence, enter)
+
 
-    if isinstance(node, dict):
-        return JetNode(_dict_to_node(node))
+def _cached_fingerprint(
+    node: JetNode
+) -> bytes | None:
+    return vars(node).get("__fingerprint__", None)
 
-    return node
+
+def _invalidate(
+    node: JetNode
+) -> None:
+    # a node without cached fingerprint has no cached ancestors,
+    # so only the path to the root is visited
+    stack = [node]
+    while stack:
+        state = vars(stack.pop())
+        if state.pop("__fingerprint__", None) is None:
+            continue
+        for ref in state.get("__parents__", {}).values():
+            parent = ref()
+            if parent is not None:
+                stack.append(parent)
+
+
+def _mutated(
+    node: JetNode,
+    keys: Iterable
+) -> None:
+    # nodes of interpolated trees refer to their root, their mutations are
+    # recorded as long as the root holds a plan, so the next override
+    # updates the plan instead of evaluating stale templates
+    state = node.__dict__
+    if "__fingerprint__" in state:
+        _invalidate(node)
+    ref = state.get("__root__", None)
+    root = ref() if ref is not None else None
+    if root is not None and "__plan__" in root.__dict__:
+        mutations = root.__dict__.setdefault("__mutations__", {})
+        for key in keys:
+            mutations[(id(node), key)] = node
+
+
+def _track(
+    tree: JetNode,
+    node: Any = None,
+    owned: set[int] | None = None
+) -> None:
+    # links nodes of the subtree at node, the whole tree by default, to the
+    # root. if owned is given, only containers of these ids are visited,
+    # other ones are shared with another tree and stay linked to it
+    ref = weakref.ref(tree)
+    node = tree if node is None else node
+    stack = [node] if isinstance(node, (JetNode, list)) else []
+    while stack:
+        node = stack.pop()
+        if isinstance(node, JetNode):
+            vars(node)["__root__"] = ref
+        stack.extend([v for v in (node.values() if isinstance(node, dict) else node)
+                      if isinstance(v, (JetNode, list)) and (owned is None or id(v) in owned)])
 
 
 class JetNode(adict):
@@ -44,33 +201,113 @@ class JetNode(adict):
         # use adict constructor
         super().__init__(cfg)
 
+    # mutations invalidate cached fingerprints of the node and its ancestors
+    # and are recorded for the interpolation plan of its tree, see _mutated
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        if self.__dict__:
+            _mutated(self, (key,))
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        if self.__dict__:
+            _mutated(self, (key,))
+
+    def __ior__(self, other: Any) -> JetNode:
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        if not self.__dict__:
+            return super().update(*args, **kwargs)
+        other = dict(*args, **kwargs)
+        super().update(other)
+        _mutated(self, other)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return super().__getitem__(key)
+
+    def pop(self, *args: Any) -> Any:
+        value = super().pop(*args)
+        if self.__dict__:
+            _mutated(self, args[:1])
+        return value
+
+    def popitem(self) -> tuple[Any, Any]:
+        item = super().popitem()
+        if self.__dict__:
+            _mutated(self, item[:1])
+        return item
+
+    def clear(self) -> None:
+        keys = list(self) if self.__dict__ else None
+        super().clear()
+        if keys is not None:
+            _mutated(self, keys)
+
+    def __getstate__(self) -> dict:
+        # caches are not pickled and copied, parent links are weak references
+        state = dict(self.__dict__)
+        state.pop("__fingerprint__", None)
+        state.pop("__parents__", None)
+        state.pop("__root__", None)
+        state.pop("__mutations__", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if "__plan__" in state:
+            # children are unpickled first, so the whole tree is tracked
+            _track(self)
+
+    def fingerprint(self) -> str:
+        """
+        Returns a deterministic hash of the subtree.
+
+        Returns
+        -------
+        str
+            Hex digest, which does not depend on key order and on Python
+            hash randomization. It is cached and invalidated by mutations
+            of the node or any of its descendant nodes, so only nodes on the
+            path to a changed one are hashed again. In-place changes of lists
+            are not tracked, assign a new list instead.
+        """
+        return _node_digest(self).hex()
+
     @staticmethod
     def read(
         path: str
     ) -> JetNode:
         from jetcon.read import read
-        return read(path, reset=True, compose=True)
+        return read(path, compose=True)
 
     def build(
         self,
-        partial: bool = True
+        partial: bool = True,
+        workers: int | None = None,
+        lazy: bool = False,
+        cache: Any = None
     ) -> Any:
-        from jetcon.build import build
-        # build copied version to be able to secure the original tree
-        return build(deepcopy(self), recursive=True, partial=partial)
+        from jetcon.config import JetConfig
+        # build never modifies the original tree, no need to copy it
+        return JetConfig.build(self, partial=partial, workers=workers, lazy=lazy,
+                               cache=cache)
 
     def cast(
         self,
         factory: Callable,
     ) -> Any:
         from jetcon.cast import cast
-        return cast(deepcopy(self), factory=factory)
+        return cast(self, factory=factory)
 
     def to_dict(
         self
     ) -> dict:
         from jetcon.cast import to_dict
-        return to_dict(deepcopy(self), recursive=True)
+        return to_dict(self, recursive=True)
 
     def merge(
         self,
@@ -79,6 +316,13 @@ class JetNode(adict):
         from jetcon.merge import merge
         return merge(self, node)
 
+    def override(
+        self,
+        overrides: dict[str, Any]
+    ) -> JetNode:
+        from jetcon.override import override
+        return override(self, overrides)
+
     def save(
         self,
         path: str
@@ -0,0 +1,142 @@
+from typing import Any
+
+from jetcon.node import JetNode, _to_node
+from jetcon.merge import merge, _index, _Items, ESCAPE_CHAR
+from jetcon.interpolate import get_plan, set_plan, mutations, compile_plan, update_plan, evaluate
+
+
+def _key(
+    spec: str,
+    key: str,
+    target: Any
+) -> tuple[Any, bool, Any]:
+    # resolves a key of a dotted path against the overridden tree, returns
+    # the key of the nested override, whether it replaces the value, and
+    # the overridden value, i.e. the target of the next key
+    replace = key.endswith(ESCAPE_CHAR)
+    base = key[:-1] if replace else key
+
+    if isinstance(target, list):
+        # keys of lists are indices of existing items
+        if not base.isdigit() or int(base) >= len(target):
+            raise ValueError(f"Invalid list index {key} in override: {spec}.")
+        index = int(base)
+        return index, replace, None if replace else target[index]
+
+    if replace or not isinstance(target, JetNode):
+        return key, replace, None
+    return key, replace, target[base] if base in target else target.get(base + ESCAPE_CHAR)
+
+
+def _nest(
+    overrides: dict[str, Any],
+    tree: Any = None
+) -> JetNode:
+    # converts dotted overrides {"a.b!": 1} to nodes {"a": {"b!": 1}}.
+    # lists of tree are overridden by items, e.g. "layers.0.size"
+    root = JetNode({}, recursive=False)
+    for spec, value in overrides.items():
+        keys = spec.split(".")
+
+        node, target = root, tree
+        for key in keys[:-1]:
+            key, replace, target = _key(spec, key, target)
+            if isinstance(node, _Items) and replace:
+                node.replace.add(key)
+            child = _Items() if isinstance(target, list) else JetNode({}, recursive=False)
+            child = dict.setdefault(node, key, child)
+            if not isinstance(child, (JetNode, _Items)):
+                raise ValueError(f"Conflicting override: {spec}.")
+            node = child
+
+        key, replace, _ = _key(spec, keys[-1], target)
+        if isinstance(node, _Items) and replace:
+            node.replace.add(key)
+        dict.__setitem__(node, key, _to_node(value))
+
+    return root
+
+
+def _changed(
+    src: JetNode | _Items,
+    dst: Any,
+    path: tuple,
+    changed: list[tuple]
+) -> None:
+    # collects paths of values overwritten by merge(dst, src),
+    # paths contain actual keys of dst, e.g. "model!" if dst has it
+    if isinstance(src, _Items):
+        for i, value in src.items():
+            replace = i in src.replace
+            if not replace and _nested(value, dst[i]):
+                _changed(value, dst[i], path + (i,), changed)
+            else:
+                changed.append(path + (i,))
+        return
+
+    index = _index(dst) if isinstance(dst, JetNode) else dict()
+    for base, (key, replace) in _index(src).items():
+        value = src[key]
+        dk = index[base][0] if base in index else base
+        sub = dst[dk] if base in index else None
+
+        if not replace and _nested(value, sub):
+            _changed(value, sub, path + (dk,), changed)
+        else:
+            changed.append(path + (dk,))
+
+
+def _nested(
+    src: Any,
+    dst: Any
+) -> bool:
+    # whether src is merged into dst instead of replacing it
+    return (isinstance(src, JetNode) and isinstance(dst, JetNode)) or \
+        (isinstance(src, _Items) and isinstance(dst, list))
+
+
+def override(
+    tree: JetNode,
+    overrides: dict[str, Any]
+) -> JetNode:
+    """
+    Merges dotted path overrides into an interpolated tree in place.
+
+    Parameters
+    ----------
+    tree : JetNode
+        The interpolated tree, e.g. returned by read.
+    overrides : dict[str, Any]
+        Maps dotted paths to values, e.g. {"optim.lr": 0.1}. Keys support
+        merge syntax, e.g. {"model!": {...}} replaces the whole section.
+
+    Returns
+    -------
+    JetNode
+        The same tree. Only interpolated values that depend on overridden
+        paths, or on paths changed in place since the last interpolation,
+        are interpolated again. In-place changes of lists are not tracked,
+        assign a new list instead.
+    """
+    src = _nest(overrides, tree)
+
+    plan = get_plan(tree)
+    # values changed since the last interpolation are updated as well
+    changed = mutations(tree) if plan is not None else []
+    # the plan is detached while the tree is merged and evaluated,
+    # so changes made here are not recorded
+    vars(tree).pop("__plan__", None)
+
+    _changed(src, tree, tuple(), changed)
+    merge(tree, src)
+
+    if plan is None:
+        # tree was not interpolated by jetcon, interpolate it as a whole
+        plan, paths = compile_plan(tree), None
+    else:
+        plan, paths = update_plan(plan, tree, changed)
+
+    evaluate(tree, plan, paths)
+    set_plan(tree, plan)
+
+    return tree
@@ -0,0 +1,168 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, NamedTuple
+
+
+class Event(NamedTuple):
+    # "parse", "read", "import", "interpolate", "resolve" or "build"
+    phase: str
+    # file path, import spec, interpolated template or factory spec
+    name: str
+    # dotted tree path of the node, empty for file events
+    path: str
+    # wall time, events of nested phases are included, e.g. imports in reads
+    seconds: float
+    # net traced allocations in bytes, None unless tracemalloc is tracing
+    memory: int | None
+
+
+# This registry holds listeners of profiling events.
+# Instrumented code checks it before measuring anything,
+# so profiling costs a single check when no listener is registered.
+# Listeners may be called from executor threads during parallel builds.
+LISTENERS: list[Callable[[Event], Any]] = list()
+
+
+def register_listener(
+    listener: Callable[[Event], Any]
+) -> None:
+    """
+    Registers a listener of profiling events.
+
+    Parameters
+    ----------
+    listener : Callable[[Event], Any]
+        Called with every event of read, import, interpolation, spec
+        resolution and build phases.
+
+    Returns
+    -------
+    None
+    """
+    LISTENERS.append(listener)
+
+
+def remove_listener(
+    listener: Callable[[Event], Any]
+) -> None:
+    if listener in LISTENERS:
+        LISTENERS.remove(listener)
+
+
+def _start() -> tuple[float, int | None]:
+    memory = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+    return time.perf_counter(), memory
+
+
+def _emit(
+    phase: str,
+    name: Any,
+    path: tuple,
+    start: tuple[float, int | None]
+) -> None:
+    seconds = time.perf_counter() - start[0]
+    memory = None
+    if start[1] is not None and tracemalloc.is_tracing():
+        memory = tracemalloc.get_traced_memory()[0] - start[1]
+
+    event = Event(phase, str(name), ".".join(map(str, path)), seconds, memory)
+    # listeners may be removed by other threads
+    for listener in tuple(LISTENERS):
+        listener(event)
+
+
+class Profile:
+    # Listener collecting events, see profile.
+    def __init__(self) -> None:
+        self.events: list[Event] = list()
+
+    def __call__(
+        self,
+        event: Event
+    ) -> None:
+        self.events.append(event)
+
+    def slowest(
+        self,
+        phase: str,
+        n: int = 10,
+        by: str = "name"
+    ) -> list[tuple[str, float, int]]:
+        # (name or path, total seconds, count) of the slowest entries
+        totals: dict[str, list] = dict()
+        for event in self.events:
+            if event.phase == phase:
+                total = totals.setdefault(getattr(event, by), [0.0, 0])
+                total[0] += event.seconds
+                total[1] += 1
+        rows = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+        return [(key, seconds, count) for key, (seconds, count) in rows[:n]]
+
+    def summary(
+        self,
+        n: int = 10
+    ) -> str:
+        """
+        Formats the slowest files, imports, specs, factories and nodes.
+
+        Parameters
+        ----------
+        n : int
+            Number of entries per section.
+
+        Returns
+        -------
+        str
+            The report, times of files include times of their imports.
+        """
+        sections = (
+            ("Files", "read", "name"),
+            ("Parsing", "parse", "name"),
+            ("Imports", "import", "name"),
+            ("Interpolated values", "interpolate", "path"),
+            ("Spec resolution", "resolve", "name"),
+            ("Factories", "build", "name"),
+            ("Built nodes", "build", "path"),
+        )
+        lines = list()
+        for title, phase, by in sections:
+            rows = self.slowest(phase, n, by)
+            if not rows:
+                continue
+            lines.append(f"{title}:")
+            for key, seconds, count in rows:
+                lines.append(f"  {seconds * 1e3:>10.2f} ms {count:>6}x  {key or '<root>'}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile(
+    memory: bool = False
+) -> Iterator[Profile]:
+    """
+    Collects profiling events of the enclosed code.
+
+    Parameters
+    ----------
+    memory : bool
+        Whether to trace allocations, tracemalloc is started if needed.
+        Tracing slows the code down, so times are less accurate.
+
+    Yields
+    ------
+    Profile
+        The collected events, call Profile.summary to print the slowest
+        files and factories.
+    """
+    collector = Profile()
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    register_listener(collector)
+    try:
+        yield collector
+    finally:
+        remove_listener(collector)
+        if started:
+            tracemalloc.stop()
@@ -1,20 +1,46 @@
+import os
 import yaml     # type: ignore
+import threading
 from pathlib import Path
 from typing import Callable
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
+from jetcon.backend import yaml_loader
 from jetcon.context import JetContext
-from jetcon.node import JetNode
+from jetcon.graph import import_graph
+from jetcon.node import JetNode, _copy
+from jetcon.profile import LISTENERS, _start, _emit
 
 
 # This registry maps extenstions to reader functions.
 # Each reader function takes a string path and compose flag,
 # that regulate _import_ behavior (True = import and merge).
 READERS = dict()
+# Extensions whose readers return already composed and interpolated trees,
+# e.g. binary snapshots. Such trees are not composed and cached again.
+COMPOSED_READERS = set()
+
+# Parse cache maps resolved paths to file signatures and parsed trees.
+# Signature is a (mtime, size) pair, so modified files are parsed again.
+# Cached trees are never returned directly, only their structural copies,
+# since compose and merge modify trees in place.
+CACHE: OrderedDict[Path, tuple[tuple[int, int], JetNode]] = OrderedDict()
+# Maximum number of cached files, least recently used are evicted first.
+CACHE_SIZE = 128
+# Files are parsed concurrently during prefetch, see read(workers=...)
+CACHE_LOCK = threading.Lock()
+
+# Directory of the on-disk compose cache, if read is called without cache_dir.
+# Composed trees are stored there with their import graphs and are returned
+# without parsing while none of the imported files is changed.
+CACHE_DIR_ENV = "JETCON_CACHE_DIR"
 
 
 def register_reader(
     ext: str,
-    reader: Callable[[Path], JetNode]
+    reader: Callable[[Path], JetNode],
+    composed: bool = False
 ) -> None:
     """
     Registers a reader function for a given file extension.
@@ -25,12 +51,139 @@ def register_reader(
         The file extension to associate with the reader function.
     reader : Callable[[Path | str], JetNode]
         The reader function to register.
+    composed : bool
+        Whether the reader returns composed and interpolated trees.
 
     Returns
     -------
     None
     """
     READERS[ext] = reader
+    if composed:
+        COMPOSED_READERS.add(ext)
+    else:
+        COMPOSED_READERS.discard(ext)
+    # cached trees may be produced by the replaced reader
+    invalidate_cache()
+
+
+def set_cache_size(
+    size: int
+) -> None:
+    """
+    Sets the maximum number of files kept in the parse cache.
+
+    Parameters
+    ----------
+    size : int
+        The maximum number of cached files. Zero disables caching.
+
+    Returns
+    -------
+    None
+    """
+    global CACHE_SIZE
+
+    if size < 0:
+        raise ValueError(f"Cache size must be non-negative, got {size}.")
+
+    with CACHE_LOCK:
+        CACHE_SIZE = size
+        while len(CACHE) > CACHE_SIZE:
+            CACHE.popitem(last=False)
+
+
+def invalidate_cache(
+    path: str | Path | None = None
+) -> None:
+    """
+    Removes a file from the parse cache.
+
+    Parameters
+    ----------
+    path : str | Path | None
+        The file to remove. If None, the whole cache is cleared.
+
+    Returns
+    -------
+    None
+    """
+    with CACHE_LOCK:
+        if path is None:
+            CACHE.clear()
+        else:
+            CACHE.pop(Path(path).resolve(), None)
+
+
+def _reader(
+    path: Path,
+    reader: Callable[[Path], JetNode]
+) -> JetNode:
+    if not LISTENERS:
+        return reader(path)
+    start = _start()
+    tree = reader(path)
+    _emit("parse", path, (), start)
+    return tree
+
+
+def _load(
+    path: Path,
+    reader: Callable[[Path], JetNode]
+) -> JetNode:
+    # returns the cached tree itself, callers must not modify it
+    if CACHE_SIZE == 0:
+        return _reader(path, reader)
+
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with CACHE_LOCK:
+        cached = CACHE.get(path, None)
+        if cached is not None and cached[0] == signature:
+            CACHE.move_to_end(path)
+            return cached[1]
+
+    # parse outside of the lock, so files are parsed concurrently
+    tree = _reader(path, reader)
+    with CACHE_LOCK:
+        CACHE[path] = (signature, tree)
+        CACHE.move_to_end(path)
+        # evict least recently used files
+        while len(CACHE) > CACHE_SIZE:
+            CACHE.popitem(last=False)
+
+    return tree
+
+
+def _parse(
+    path: Path,
+    reader: Callable[[Path], JetNode]
+) -> JetNode:
+    if CACHE_SIZE == 0:
+        return _reader(path, reader)
+    return _copy(_load(path, reader))
+
+
+def sources(
+    node: JetNode
+) -> list[Path]:
+    """
+    Returns files that were read to produce a tree.
+
+    Parameters
+    ----------
+    node : JetNode
+        The tree returned by a top level read call.
+
+    Returns
+    -------
+    list[Path]
+        Resolved paths, the root config goes first. The list is empty
+        for trees that were not produced by read.
+    """
+    graph = import_graph(node)
+    return [] if graph is None else list(graph.files)
 
 
 def read_yaml(
@@ -42,19 +195,69 @@ def read_yaml(
     #     parent = JetContext._get_resolver()
     #     path = (Path(parent) / path).resolve()
 
-    # load and construct JetNode
+    # loader constructs JetNodes, only top level lists are converted
     with path.open("r") as file:
-        tree = yaml.safe_load(file)
-    return JetNode(tree)
+        tree = yaml.load(file, Loader=yaml_loader())
+    return tree if isinstance(tree, JetNode) else JetNode(tree)
 
 
 register_reader(".yaml", read_yaml)
 register_reader(".yml", read_yaml)
 
 
+def _read(
+    path: Path,
+    ext: str,
+    reader: Callable[[Path], JetNode],
+    compose: bool
+) -> JetNode:
+    start = _start() if LISTENERS else None
+    memo = JetContext._memo() if compose else None
+    if memo is not None:
+        tree = memo.get(path)
+        if tree is not None:
+            if start is not None:
+                _emit("read", path, (), start)
+            return tree
+
+    JetContext._add_visit(path)
+    # read title config and compose it recursively
+    try:
+        if ext in COMPOSED_READERS:
+            # composed readers track their sources and are not cached,
+            # since their result depends on other files
+            tree = reader(path)
+        elif compose:
+            # import it here instead of top level due to circular imports
+            from jetcon.compose import compose as _compose
+            from jetcon.interpolate import interpolate as _interpolate
+            JetContext._add_source(path)
+            # compose rebuilds every container, so the cached tree is
+            # composed without a copy and the result is interpolated
+            # in place, i.e. the tree is copied once instead of three times
+            tree = _compose(_load(path, reader))
+            tree = _interpolate(tree, inplace=True)
+        else:
+            JetContext._add_source(path)
+            tree = _parse(path, reader)
+        # free deps stack
+    except Exception as e:
+        raise RuntimeError('Exception occurred during config "{}" reading'.format(path))
+    finally:
+        JetContext._rm_visit(path)
+
+    if memo is not None:
+        memo.put(path, tree)
+    if start is not None:
+        _emit("read", path, (), start)
+    return tree
+
+
 def read(
     path: str | Path,
-    compose: bool = True
+    compose: bool = True,
+    workers: int | None = None,
+    cache_dir: str | Path | None = None
 ) -> JetNode:
     if not isinstance(path, Path):
         path = Path(path)
@@ -67,20 +270,36 @@ def read(
     if reader is None:
         raise ValueError(f"Cannot read from file with {ext}.")
 
-    JetContext._add_visit(path)
-    # read title config and compose it recursively
+    # top level call starts a new context, nested calls share it
+    token = JetContext._enter()
     try:
-        tree = reader(path)
-        if compose:
-            # import it here instead of top level due to circular imports
-            from jetcon.compose import compose as _compose
-            from jetcon.interpolate import interpolate as _interpolate
-            tree = _compose(tree)
-            tree = _interpolate(tree)
-        # free deps stack
-    except Exception as e:
-        raise RuntimeError('Exception occurred during config "{}" reading'.format(path))
+        if cache_dir is None:
+            cache_dir = os.environ.get(CACHE_DIR_ENV, None)
+        cached = (token is not None and compose and bool(cache_dir)
+                  and ext not in COMPOSED_READERS)
+
+        tree = None
+        if cached:
+            from jetcon.snapshot import _load_cached
+            tree = _load_cached(path, cache_dir)
+
+        if tree is None:
+            if token is not None and compose and workers is not None and CACHE_SIZE > 0:
+                from jetcon.compose import prefetch
+                # parse the whole import graph concurrently into the parse cache,
+                # composition below stays sequential and gets cached trees
+                with ThreadPoolExecutor(workers) as executor:
+                    prefetch(path, executor)
+
+            tree = _read(path, ext, reader, compose)
+
+            if cached and isinstance(tree, JetNode):
+                from jetcon.snapshot import _save_cached
+                _save_cached(tree, JetContext._graph(), cache_dir)
+
+        if token is not None and isinstance(tree, JetNode):
+            vars(tree)["__graph__"] = JetContext._graph()
     finally:
-        JetContext._rm_visit(path)
+        JetContext._exit(token)
 
     return tree
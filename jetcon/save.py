@@ -2,16 +2,21 @@ import yaml     # type: ignore
 from pathlib import Path
 from typing import Callable
 
+from jetcon.backend import yaml_dumper
 from jetcon.node import JetNode
 from jetcon.cast import to_dict
 
 
 SAVERS = dict()
+# Extensions whose savers take JetNode trees as is instead of dicts,
+# e.g. binary snapshots that need source files of the tree.
+RAW_SAVERS = set()
 
 
 def register_saver(
     ext: str,
-    saver: Callable[[Path, dict], None]
+    saver: Callable[[Path, dict], None],
+    raw: bool = False
 ) -> None:
     """
     Registers a saver function for a given file extension.
@@ -22,12 +27,18 @@ def register_saver(
         The file extension to associate with the saver function.
     saver : Callable[[Path, dict], None]
         The saver function to register.
+    raw : bool
+        Whether the saver takes JetNode trees instead of dicts.
 
     Returns
     -------
     None
     """
     SAVERS[ext] = saver
+    if raw:
+        RAW_SAVERS.add(ext)
+    else:
+        RAW_SAVERS.discard(ext)
 
 
 def save_yaml(
@@ -38,7 +49,7 @@ def save_yaml(
         raise ValueError(f"File already exists: {str(path)}")
 
     with path.open("w") as file:
-        yaml.safe_dump(node, file)
+        yaml.dump(node, file, Dumper=yaml_dumper())
 
 
 register_saver(".yaml", save_yaml)
@@ -52,7 +63,10 @@ def save(
     if not isinstance(path, Path):
         path = Path(path)
 
-    tree = to_dict(node, recursive=True)
     ext = path.suffix.lower()
 
+    if ext in RAW_SAVERS:
+        return SAVERS[ext](node, path)
+
+    tree = to_dict(node, recursive=True)
     return SAVERS[ext](tree, path)
@@ -0,0 +1,182 @@
+import os
+import marshal
+import hashlib
+import tempfile
+from pathlib import Path
+from warnings import warn
+
+from jetcon.node import JetNode, _track
+from jetcon.cast import to_dict
+from jetcon.context import JetContext
+from jetcon.graph import ImportGraph, import_graph
+from jetcon.interpolate import Plan, get_plan, set_plan
+from jetcon.read import read, register_reader
+from jetcon.save import register_saver
+
+# Snapshot is a marshalled composed tree prefixed with this header.
+# It also stores the import graph of source files with their content
+# hashes, so stale snapshots are detected and read from sources again,
+# and interpolation templates, so restored trees can be overridden.
+MAGIC = b"JETC"
+VERSION = 1
+
+
+def _dump_plan(
+    node: JetNode
+) -> tuple | None:
+    # (path, template, refs) triplets of interpolated values
+    plan = get_plan(node) if isinstance(node, JetNode) else None
+    if plan is None:
+        return None
+    return tuple((path, template, tuple(refs))
+                 for path, (template, refs) in plan.slots.items())
+
+
+def _load_plan(
+    slots: tuple | None
+) -> Plan | None:
+    if slots is None:
+        return None
+    return Plan({path: (template, list(refs)) for path, template, refs in slots})
+
+
+def _dumps(
+    node: JetNode,
+    graph: ImportGraph
+) -> bytes:
+    snapshot = {
+        "version": VERSION,
+        "closure": graph.digest(),
+        "graph": graph.to_dict(),
+        "tree": to_dict(node, recursive=True),
+        "plan": _dump_plan(node),
+    }
+    # raises ValueError for non builtin types
+    return MAGIC + marshal.dumps(snapshot)
+
+
+def _loads(
+    data: bytes
+) -> dict | None:
+    # returns None for snapshots of other versions
+    snapshot = marshal.loads(data[len(MAGIC):])
+    if snapshot.get("version", None) != VERSION:
+        return None
+    return snapshot
+
+
+def _restore(
+    snapshot: dict,
+    graph: ImportGraph
+) -> JetNode:
+    # records snapshot sources, as if they were read by the current call
+    context = JetContext._graph()
+    for path, digest in graph.files.items():
+        context.add_file(path, digest)
+    for edge in graph.edges:
+        context.add_edge(*edge)
+
+    tree = JetNode(snapshot["tree"])
+    plan = _load_plan(snapshot["plan"])
+    if plan is not None:
+        # overrides update values interpolated from overridden ones
+        _track(tree)
+        set_plan(tree, plan)
+    return tree
+
+
+def save_snapshot(
+    node: JetNode,
+    path: Path
+) -> None:
+    if path.exists():
+        raise ValueError(f"File already exists: {str(path)}")
+
+    graph = import_graph(node) or ImportGraph()
+    try:
+        data = _dumps(node, graph)
+    except ValueError:
+        raise ValueError("Snapshot supports only builtin scalar types, "
+                         f"lists and dicts. Cannot save: {str(path)}")
+
+    with path.open("wb") as file:
+        file.write(data)
+
+
+def read_snapshot(
+    path: Path
+) -> JetNode:
+    with path.open("rb") as file:
+        data = file.read()
+
+    if not data.startswith(MAGIC):
+        raise ValueError(f"File is not a jetcon snapshot: {str(path)}")
+
+    snapshot = _loads(data)
+    if snapshot is None:
+        raise ValueError(f"Unsupported snapshot version: {str(path)}")
+
+    graph = ImportGraph.from_dict(snapshot["graph"])
+    if not graph.is_stale():
+        return _restore(snapshot, graph)
+
+    root = graph.root
+    if root is None:
+        raise RuntimeError(f"Snapshot {str(path)} is stale and has no sources.")
+
+    warn(f"Snapshot {str(path)} is stale. Reading from {root}")
+    return read(root, compose=True)
+
+
+def _cache_file(
+    path: Path,
+    cache_dir: str | Path
+) -> Path:
+    # cached trees are keyed by root configs and validated by closures
+    name = hashlib.sha256(str(path).encode()).hexdigest()
+    return Path(cache_dir) / (name + ".jetc")
+
+
+def _load_cached(
+    path: Path,
+    cache_dir: str | Path
+) -> JetNode | None:
+    try:
+        data = _cache_file(path, cache_dir).read_bytes()
+        snapshot = _loads(data) if data.startswith(MAGIC) else None
+    except (OSError, ValueError, EOFError, TypeError):
+        # missing or corrupted entry is read from sources again
+        return None
+
+    if snapshot is None:
+        return None
+
+    graph = ImportGraph.from_dict(snapshot["graph"])
+    if graph.root != path or graph.is_stale() or graph.digest() != snapshot["closure"]:
+        return None
+    return _restore(snapshot, graph)
+
+
+def _save_cached(
+    node: JetNode,
+    graph: ImportGraph,
+    cache_dir: str | Path
+) -> None:
+    try:
+        data = _dumps(node, graph)
+    except ValueError:
+        # trees with non builtin types are not cached
+        return
+
+    target = _cache_file(graph.root, cache_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # write to a temporary file first, so concurrent readers never
+    # see partially written entries
+    fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as file:
+        file.write(data)
+    os.replace(tmp, target)
+
+
+register_reader(".jetc", read_snapshot, composed=True)
+register_saver(".jetc", save_snapshot, raw=True)
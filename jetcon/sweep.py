@@ -0,0 +1,213 @@
+import json
+import random
+import hashlib
+import weakref
+import itertools
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+from jetcon.node import JetNode
+from jetcon.merge import merged
+from jetcon.override import _nest, _changed
+from jetcon.interpolate import get_plan, set_plan, update_plan, evaluate
+
+
+class Variant(NamedTuple):
+    # stable hash of overrides, it does not depend on the order of axes
+    key: str
+    overrides: dict[str, Any]
+    node: JetNode
+
+
+def _hash(
+    overrides: dict[str, Any]
+) -> str:
+    data = json.dumps(overrides, sort_keys=True, default=repr)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _own(
+    tree: JetNode,
+    path: tuple,
+    owned: set[int]
+) -> None:
+    # copies containers shared with the base along the path,
+    # so the value at the path can be assigned in place
+    node = tree
+    for key in path[:-1]:
+        child = node[key]
+        if id(child) not in owned:
+            if isinstance(child, JetNode):
+                child = JetNode(child, recursive=False)
+            else:
+                child = list(child)
+            owned.add(id(child))
+            node[key] = child
+        node = child
+
+
+def _link(
+    tree: JetNode,
+    paths: list[tuple],
+    owned: set[int]
+) -> None:
+    # links containers copied along paths to the variant, so its mutations
+    # are recorded for its plan. subtrees shared with base stay linked to
+    # base, values at paths are linked by update_plan and evaluate.
+    ref = weakref.ref(tree)
+    for path in paths:
+        node = tree
+        for key in path[:-1]:
+            if isinstance(node, JetNode) and id(node) in owned:
+                vars(node)["__root__"] = ref
+            node = node[key]
+        if isinstance(node, JetNode) and id(node) in owned:
+            vars(node)["__root__"] = ref
+
+
+def variant(
+    base: JetNode,
+    overrides: dict[str, Any]
+) -> JetNode:
+    """
+    Creates a variant of a tree overridden with dotted path overrides.
+
+    Parameters
+    ----------
+    base : JetNode
+        The base tree, it is not modified.
+    overrides : dict[str, Any]
+        Maps dotted paths to values, e.g. {"optim.lr": 0.1}.
+
+    Returns
+    -------
+    JetNode
+        The overridden tree. It shares every unchanged subtree with base,
+        so copy it before modifying in place.
+    """
+    src = _nest(overrides, base)
+
+    changed: list[tuple] = list()
+    _changed(src, base, tuple(), changed)
+
+    owned: set[int] = set()
+    tree = merged(base, src, owned)
+
+    plan = get_plan(base)
+    if plan is not None:
+        plan, paths = update_plan(plan, tree, changed)
+        for path in paths:
+            _own(tree, path, owned)
+        evaluate(tree, plan, paths)
+        _link(tree, changed + paths, owned)
+        set_plan(tree, plan)
+
+    return tree
+
+
+def sweep(
+    base: JetNode,
+    overrides: Iterable[dict[str, Any]]
+) -> Iterator[Variant]:
+    """
+    Lazily creates variants of a tree.
+
+    Parameters
+    ----------
+    base : JetNode
+        The base tree, it is not modified.
+    overrides : Iterable[dict[str, Any]]
+        Dotted path overrides of every variant.
+
+    Yields
+    ------
+    Variant
+        The hash of overrides, overrides and the overridden tree.
+    """
+    for item in overrides:
+        yield Variant(_hash(item), item, variant(base, item))
+
+
+def grid(
+    base: JetNode,
+    axes: dict[str, list]
+) -> Iterator[Variant]:
+    """
+    Lazily creates variants for every combination of axes values.
+
+    Parameters
+    ----------
+    base : JetNode
+        The base tree, it is not modified.
+    axes : dict[str, list]
+        Maps dotted paths to values, e.g. {"optim.lr": [0.1, 0.01]}.
+
+    Yields
+    ------
+    Variant
+        Variants in the order of itertools.product.
+    """
+    keys = list(axes)
+    values = itertools.product(*(axes[k] for k in keys))
+    return sweep(base, (dict(zip(keys, v)) for v in values))
+
+
+def zipped(
+    base: JetNode,
+    axes: dict[str, list]
+) -> Iterator[Variant]:
+    """
+    Lazily creates variants for axes values taken in lockstep.
+
+    Parameters
+    ----------
+    base : JetNode
+        The base tree, it is not modified.
+    axes : dict[str, list]
+        Maps dotted paths to values of the same length.
+
+    Yields
+    ------
+    Variant
+        The i-th variant overrides every path with its i-th value.
+    """
+    if len({len(v) for v in axes.values()}) > 1:
+        raise ValueError("Zipped axes must have the same length.")
+
+    keys = list(axes)
+    values = zip(*(axes[k] for k in keys))
+    return sweep(base, (dict(zip(keys, v)) for v in values))
+
+
+def sample(
+    base: JetNode,
+    axes: dict[str, list | Callable[[random.Random], Any]],
+    n: int,
+    seed: int | None = None
+) -> Iterator[Variant]:
+    """
+    Lazily creates randomly sampled variants.
+
+    Parameters
+    ----------
+    base : JetNode
+        The base tree, it is not modified.
+    axes : dict[str, list | Callable]
+        Maps dotted paths to values to choose from or to functions, which
+        take random.Random and return a value, e.g. lambda r: r.uniform(0, 1).
+    n : int
+        The number of variants.
+    seed : int | None
+        The seed, variants are reproducible if it is given.
+
+    Yields
+    ------
+    Variant
+        Sampled variants. Duplicates are possible for discrete axes.
+    """
+    rng = random.Random(seed)
+
+    def _draw() -> dict[str, Any]:
+        return {k: v(rng) if callable(v) else rng.choice(v)
+                for k, v in axes.items()}
+
+    return sweep(base, (_draw() for _ in range(n)))
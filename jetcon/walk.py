@@ -0,0 +1,167 @@
+from typing import Any, Callable, Iterator
+
+# Returned by enter callbacks to descend into a container as usual.
+DESCEND = object()
+
+# Trees are transformed recursively up to this depth, deeper subtrees are
+# transformed with an explicit stack. Recursion is cheaper per node, while
+# the stack never overflows, so configs of usual depth take the fast path
+# and generated deep trees do not hit the recursion limit.
+RECURSION_DEPTH = 32
+
+
+def transform(
+    node: Any,
+    kinds: tuple[type, ...],
+    mapping: Callable[[Any, dict], Any] | None = None,
+    sequence: Callable[[Any, list], Any] | None = None,
+    enter: Callable[[Any], Any] | None = None
+) -> Any:
+    """
+    Transforms a tree bottom up.
+
+    Parameters
+    ----------
+    node : Any
+        The tree, dicts and lists of given kinds are descended into.
+    kinds : tuple[type, ...]
+        Container types to descend into, e.g. (JetNode, list).
+    mapping : Callable[[Any, dict], Any] | None
+        Takes a dict and a new dict of its children, where nested
+        containers are transformed already. Returns the transformed
+        container. If None, the new dict is used as is.
+    sequence : Callable[[Any, list], Any] | None
+        The same for lists, children are given as a new list.
+    enter : Callable[[Any], Any] | None
+        Called for every container, including the root, right before it is
+        visited. Returns DESCEND to visit it or a value to use instead.
+
+    Returns
+    -------
+    Any
+        The transformed tree. Leaves are not transformed. Deep trees do not
+        hit the recursion limit.
+    """
+    def visit(node: Any, depth: int) -> Any:
+        if depth == RECURSION_DEPTH:
+            return _transform(node, kinds, mapping, sequence, enter)
+        if enter is not None:
+            value = enter(node)
+            if value is not DESCEND:
+                return value
+
+        depth += 1
+        if isinstance(node, dict):
+            children = {k: visit(v, depth) if isinstance(v, kinds) else v
+                        for k, v in node.items()}
+            return children if mapping is None else mapping(node, children)
+        children = [visit(v, depth) if isinstance(v, kinds) else v for v in node]
+        return children if sequence is None else sequence(node, children)
+
+    return visit(node, 0) if isinstance(node, kinds) else node
+
+
+def _transform(
+    node: Any,
+    kinds: tuple[type, ...],
+    mapping: Callable[[Any, dict], Any] | None,
+    sequence: Callable[[Any, list], Any] | None,
+    enter: Callable[[Any], Any] | None
+) -> Any:
+    def leave(node: Any, values: list) -> Any:
+        if isinstance(node, dict):
+            children = dict(zip(node, values))
+            return children if mapping is None else mapping(node, children)
+        return values if sequence is None else sequence(node, values)
+
+    # frames are (container, values of children, indices of children to
+    # visit). values are collected at once, so leaves are never visited
+    # one by one, and containers without nested ones are never pushed.
+    # the bottom frame is virtual, it holds the transformed root.
+    result = [node]
+    stack = [(None, result, [0])]
+    while stack:
+        node, values, pending = stack[-1]
+        if not pending:
+            stack.pop()
+            if stack:
+                # the transformed child replaces the original one
+                _, parent, indices = stack[-1]
+                parent[indices.pop()] = leave(node, values)
+            continue
+
+        child = values[pending[-1]]
+        if enter is not None:
+            value = enter(child)
+            if value is not DESCEND:
+                values[pending.pop()] = value
+                continue
+
+        children = list(child.values()) if isinstance(child, dict) else list(child)
+        # indices of nested containers in reversed order, so they are
+        # popped in traversal order. a plain loop is cheaper than
+        # a comprehension for the small containers configs consist of
+        nested, i = None, len(children)
+        for v in reversed(children):
+            i -= 1
+            if isinstance(v, kinds):
+                if nested is None:
+                    nested = [i]
+                else:
+                    nested.append(i)
+
+        if nested is not None:
+            stack.append((child, children, nested))
+        else:
+            values[pending.pop()] = leave(child, children)
+
+    return result[0]
+
+
+def walk(
+    node: Any,
+    kinds: tuple[type, ...],
+    path: tuple = tuple()
+) -> Iterator[tuple[tuple, Any]]:
+    """
+    Iterates over a tree top down with an explicit stack.
+
+    Parameters
+    ----------
+    node : Any
+        The tree, dicts and lists of given kinds are descended into.
+    kinds : tuple[type, ...]
+        Container types to descend into, e.g. (JetNode, list).
+    path : tuple
+        The path of the tree, it prefixes every yielded path.
+
+    Yields
+    ------
+    tuple[tuple, Any]
+        Paths, i.e. tuples of keys and indices, and values of every
+        container and leaf in depth first order.
+    """
+    stack = [(path, node)]
+    while stack:
+        path, node = stack.pop()
+        yield path, node
+        if isinstance(node, kinds):
+            # reversed, so children are popped in traversal order
+            if isinstance(node, dict):
+                stack.extend((path + (k,), v) for k, v in reversed(node.items()))
+            else:
+                stack.extend((path + (i,), node[i]) for i in range(len(node) - 1, -1, -1))
+
+
+def containers(
+    node: Any,
+    kinds: tuple[type, ...]
+) -> Iterator[Any]:
+    # containers of given kinds in no particular order, leaves are skipped
+    # at once, which is cheaper for checks that do not need paths or order
+    stack = [node] if isinstance(node, kinds) else []
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend([v for v in (node.values() if isinstance(node, dict) else node)
+                      if isinstance(v, kinds)])
@@ -0,0 +1,181 @@
+import threading
+from pathlib import Path
+from typing import Any, Callable
+from warnings import warn
+
+from jetcon.node import JetNode, _copy
+from jetcon.context import JetContext
+from jetcon.graph import ImportGraph, file_hash
+from jetcon.diff import Diff, diff
+from jetcon.read import read
+
+
+class ComposeMemo:
+    # Composed trees of files read by the previous read call. Trees of
+    # unchanged files are reused, so only changed files and files importing
+    # them are composed again.
+    def __init__(self) -> None:
+        self.trees: dict[Path, Any] = dict()
+        self.graph = ImportGraph()
+
+    def get(
+        self,
+        path: Path
+    ) -> Any:
+        tree = self.trees.get(path, None)
+        if tree is None:
+            return None
+
+        # record the reused files and imports, as if they were read
+        graph = JetContext._graph()
+        closure = self.graph.closure(path)
+        for file in closure:
+            graph.add_file(file, self.graph.files[file])
+        closure = set(closure)
+        for edge in self.graph.edges:
+            if edge[0] in closure:
+                graph.add_edge(*edge)
+        # importers merge trees in place
+        return _copy(tree)
+
+    def put(
+        self,
+        path: Path,
+        tree: Any
+    ) -> None:
+        self.trees[path] = _copy(tree)
+
+    def evict(
+        self,
+        paths: set[Path]
+    ) -> None:
+        # changed files and every file importing them directly or indirectly
+        stack = list(paths)
+        while stack:
+            path = stack.pop()
+            if self.trees.pop(path, None) is not None or path in paths:
+                stack.extend(self.graph.importers(path))
+
+
+def _signature(
+    path: Path
+) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Watcher:
+    def __init__(
+        self,
+        path: str | Path,
+        callback: Callable[[JetNode, Diff], Any],
+        interval: float = 1.0
+    ) -> None:
+        self.path = Path(path).resolve()
+        self.callback = callback
+        self.interval = interval
+        self.memo = ComposeMemo()
+        self.tree = self._read()
+        self.signatures = self._signatures()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _read(self) -> JetNode:
+        token = JetContext._enter(self.memo)
+        try:
+            tree = read(self.path, compose=True)
+            graph = JetContext._graph()
+        finally:
+            JetContext._exit(token)
+
+        self.memo.graph = graph
+        if isinstance(tree, JetNode):
+            vars(tree)["__graph__"] = graph
+        return tree
+
+    def _signatures(self) -> dict[Path, tuple[int, int] | None]:
+        return {path: _signature(path) for path in self.memo.graph.files}
+
+    def poll(self) -> bool:
+        """
+        Checks imported files once and reloads the config if any is changed.
+
+        Returns
+        -------
+        bool
+            Whether the config was reloaded and the callback was called.
+        """
+        changed = set()
+        for path, signature in self.signatures.items():
+            current = _signature(path)
+            if current != signature:
+                self.signatures[path] = current
+                # touched files with the same content are skipped
+                if current is None or file_hash(path) != self.memo.graph.files[path]:
+                    changed.add(path)
+
+        if not changed:
+            return False
+
+        self.memo.evict(changed)
+        tree = self._read()
+        self.signatures = self._signatures()
+
+        changes = diff(self.tree, tree)
+        self.tree = tree
+        if changes:
+            self.callback(tree, changes)
+        return bool(changes)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                # broken edits must not stop watching, the last
+                # valid tree is kept until the config is fixed
+                warn(f"Failed to reload {self.path}: {e!r}")
+
+    def start(self) -> "Watcher":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+
+def watch(
+    path: str | Path,
+    callback: Callable[[JetNode, Diff], Any],
+    interval: float = 1.0
+) -> Watcher:
+    """
+    Watches a config and every config it imports for changes.
+
+    Parameters
+    ----------
+    path : str | Path
+        The root config.
+    callback : Callable[[JetNode, Diff], Any]
+        Called from the watcher thread with the reloaded tree and its
+        difference from the previous one.
+    interval : float
+        Polling interval in seconds.
+
+    Returns
+    -------
+    Watcher
+        The started watcher, the current tree is available as Watcher.tree.
+        Only changed files are parsed again and only files importing them
+        are composed again.
+    """
+    return Watcher(path, callback, interval).start()
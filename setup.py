@@ -8,6 +8,6 @@ setup(
     name='jetcon',
     version='0.1',
     author='Dmitry Senushkin',
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks*"]),
     install_requires=required
 )
@@ -1,6 +1,27 @@
+import asyncio
+import importlib
+import pickle
+import shutil
+import sys
+import tempfile
 import unittest
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
 
-from jetcon import JetConfig
+from jetcon import JetConfig, read, invalidate_cache, set_yaml_backend, import_graph, BuildCache, clear_import_cache
+from jetcon.backend import BACKENDS
+from jetcon.node import JetNode
+from jetcon.read import read_yaml, sources, CACHE
+from jetcon.compose import prefetch, _find_imports
+from jetcon.interpolate import interpolate
+from jetcon.sweep import grid, zipped, sample
+from jetcon.watch import Watcher
+from jetcon.diff import diff
+from jetcon.merge import merge
+from jetcon.profile import profile, LISTENERS
+from jetcon.build import CALL_PLANS, DATACLASS_FIELDS
 from dataclasses import dataclass
 
 
@@ -22,6 +43,11 @@ def FN(a, b=1, *args, **kwargs):
     return True
 
 
+async def AFN(a, delay=0.0):
+    await asyncio.sleep(delay)
+    return a
+
+
 @dataclass
 class DATACLASS:
     a: str
@@ -31,6 +57,16 @@ class DATACLASS:
         print(f"DATACLASS called with a={self.a}, b={self.b}")
 
 
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+
+@dataclass
+class FORWARD:
+    # annotation cannot be resolved at runtime
+    a: "Decimal"
+
+
 class JetConfigMethods(unittest.TestCase):
     def test_read_compose(self):
         node = JetConfig.read("./configs/import/main.yaml")
@@ -77,6 +113,163 @@ class JetConfigMethods(unittest.TestCase):
 
         print(ok)
 
+    def test_build_untouched(self):
+        node = JetNode({
+            "cls": {"_cls_": "__main__.CLS", "a": [1, 2], "b": {"c": 1}},
+        })
+        built = JetConfig.build(node)
+        built.cls.a.append(3)
+
+        # source tree must not be modified by build
+        self.assertEqual(node.cls._cls_, "__main__.CLS")
+        self.assertEqual(node.cls.a, [1, 2])
+        self.assertIsNot(built.cls.b, node.cls.b)
+
+    def test_build_workers(self):
+        node = JetNode({
+            "outer": {"_cls_": "__main__.CLS", "a": {"_fn_": "__main__.FN", "a": 1}},
+            "items": [{"_cls_": "__main__.CLS", "a": i} for i in range(8)],
+            "bad": [{"_data_": "__main__.DATACLASS", "a": i} for i in range(8)],
+        })
+        # the first failing node in tree order is reported
+        with self.assertRaisesRegex(ValueError, "Arg: a has type <class 'int'>"):
+            JetConfig.build(node, workers=4)
+
+        del node["bad"]
+        built = JetConfig.build(node, workers=4)
+        self.assertEqual(built.outer.a, True)
+        self.assertEqual([c.a for c in built["items"]], list(range(8)))
+
+    def test_abuild(self):
+        node = JetNode({
+            "items": [{"_fn_": "__main__.AFN", "a": i, "delay": 0.1} for i in range(8)],
+            "cls": {"_cls_": "__main__.CLS", "a": {"_fn_": "__main__.AFN", "a": 1}},
+        })
+        built = asyncio.run(JetConfig.abuild(node))
+        self.assertEqual(built["items"], list(range(8)))
+        self.assertEqual(built.cls.a, 1)
+
+    def test_build_lazy(self):
+        node = JetNode({
+            "train": {"_fn_": "__main__.FN", "a": {"_data_": "__main__.DATACLASS", "a": 1}},
+            "eval": {"loader": {"_cls_": "__main__.CLS", "a": "eval_a"}},
+        })
+        # broken train node is never built, since it is never accessed
+        built = JetConfig.build(node, lazy=True)
+        self.assertEqual(built.eval.loader.a, "eval_a")
+        self.assertIs(built.eval.loader, built.eval.loader)
+
+        with self.assertRaises(ValueError):
+            built.materialize()
+
+    def test_build_lazy_reads(self):
+        node = JetNode({"a": {"_fn_": "__main__.FN", "a": 1},
+                        "b": {"c": {"_fn_": "__main__.FN", "a": 2}}})
+        expected = {"a": True, "b": {"c": True}}
+        # every read path gets built values, never deferred ones
+        lazy = lambda: JetConfig.build(node, lazy=True)
+        self.assertEqual(lazy(), expected)
+        self.assertEqual(expected, lazy())
+        self.assertFalse(lazy() != lazy())
+        self.assertIs(dict(lazy())["a"], True)
+        self.assertIs((lambda **kwargs: kwargs["a"])(**lazy()), True)
+        self.assertIs(lazy().copy()["a"], True)
+        self.assertIs(lazy().pop("a"), True)
+        self.assertIs(lazy().setdefault("a"), True)
+        self.assertEqual(lazy().popitem(), ("b", {"c": True}))
+
+    def test_build_shared(self):
+        node = JetNode({
+            "shared": {"_cls_": "__main__.CLS", "a": "shared_a"},
+            "first": {"_cls_": "__main__.CLS", "a": {"_ref_": "shared"}},
+            "second": [{"_ref_": "first.a"}],
+        })
+        for built in (JetConfig.build(node), JetConfig.build(node, workers=2)):
+            self.assertIs(built.first.a, built.shared)
+            self.assertIs(built.second[0], built.shared)
+
+        node.shared.b = JetNode({"_ref_": "first"})
+        with self.assertRaises(RuntimeError):
+            JetConfig.build(node)
+
+    def test_build_deep(self):
+        # deeper than the recursion limit
+        tree = {"cls": {"_cls_": "__main__.CLS", "a": "${name}", "b": {"_ref_": "name"}}}
+        for _ in range(3000):
+            tree = {"child": tree, "items": [1, {"a": 2}]}
+        node = interpolate(JetNode({**tree, "name": "deep"}))
+
+        for built in (JetConfig.build(node), JetConfig.build(node, workers=2),
+                      JetConfig.build(node, lazy=True).materialize()):
+            for _ in range(3000):
+                built = built.child
+            self.assertEqual((built.cls.a, built.cls.b), ("deep", "deep"))
+
+        tree = JetConfig.to_dict(node)
+        for _ in range(3000):
+            tree = tree["child"]
+        self.assertEqual(tree["cls"]["a"], "deep")
+
+    def test_call_plans(self):
+        node = JetNode({"data": {"_data_": "__main__.DATACLASS", "a": "x"},
+                        "forward": {"_cls_": "__main__.FORWARD", "a": 1}})
+        JetConfig.build(node)
+        plan, fields = CALL_PLANS[DATACLASS], DATACLASS_FIELDS[DATACLASS]
+        JetConfig.build(node)
+        # signatures and type hints are introspected once per factory
+        self.assertIs(CALL_PLANS[DATACLASS], plan)
+        self.assertIs(DATACLASS_FIELDS[DATACLASS], fields)
+        # hints are resolved only by the dataclass builder
+        self.assertNotIn(FORWARD, DATACLASS_FIELDS)
+        self.assertEqual(JetConfig.build(node).forward.a, 1)
+
+    def test_import_cache(self):
+        tmp = tempfile.mkdtemp()
+        sys.path.insert(0, tmp)
+        node = JetNode({"_fn_": "jetcon_spec.FN", "a": 1})
+        try:
+            # unknown spec is resolved once, then it fails fast
+            with profile() as prof:
+                for _ in range(2):
+                    with self.assertRaises(ImportError) as ctx:
+                        JetConfig.build(node)
+                    self.assertIsInstance(ctx.exception.__cause__, ModuleNotFoundError)
+            self.assertEqual(len(prof.slowest("resolve")), 1)
+
+            # errors of existing modules are propagated and never cached
+            Path(tmp, "jetcon_spec.py").write_text("import jetcon_missing\ndef FN(a):\n    return a\n")
+            importlib.invalidate_caches()
+            clear_import_cache()
+            for _ in range(2):
+                with self.assertRaises(ModuleNotFoundError) as ctx:
+                    JetConfig.build(node)
+                self.assertEqual(ctx.exception.name, "jetcon_missing")
+
+            Path(tmp, "jetcon_missing.py").write_text("")
+            importlib.invalidate_caches()
+            self.assertEqual(JetConfig.build(node), 1)
+        finally:
+            sys.path.remove(tmp)
+            sys.modules.pop("jetcon_spec", None)
+            sys.modules.pop("jetcon_missing", None)
+            shutil.rmtree(tmp)
+            clear_import_cache()
+
+    def test_build_cache(self):
+        cache = BuildCache(maxsize=2)
+        train = JetNode({"data": {"_cls_": "__main__.CLS", "a": {"_cls_": "__main__.CLS", "a": 1}}})
+        eval_ = JetNode({"data": {"_cls_": "__main__.CLS", "a": {"_cls_": "__main__.CLS", "a": 1}},
+                         "other": {"_cls_": "__main__.CLS", "a": 1, "_cache_": False}})
+        first, second = JetConfig.build(train, cache=cache), JetConfig.build(eval_, cache=cache)
+        self.assertIs(first.data, second.data)
+        self.assertIsNot(second.other, second.data.a)
+        self.assertEqual(second.other.kwargs, {})
+        self.assertEqual(len(cache), 2)
+
+        # eviction drops the least recently used object
+        JetConfig.build(JetNode({"_cls_": "__main__.CLS", "a": 2}), cache=cache)
+        self.assertIsNot(JetConfig.build(train, cache=cache).data, first.data)
+
     def test_merge(self):
         log = LOG.format(JetConfig.merge.__name__)
         ok = OK.format(JetConfig.merge.__name__)
@@ -100,5 +293,353 @@ class JetConfigMethods(unittest.TestCase):
         print(ok)
 
 
+class ReadCache(unittest.TestCase):
+    def test_cached_copy(self):
+        invalidate_cache()
+        first = read("./configs/merge/merge.yaml")
+        first["section"]["c"] = -1
+
+        # cached tree must not be affected by in-place changes
+        second = read("./configs/merge/merge.yaml")
+        self.assertIsNot(first, second)
+        self.assertEqual(second["section"]["c"], 3)
+
+    def test_prefetch(self):
+        invalidate_cache()
+        parallel = read("./configs/merge/main.yaml", workers=4)
+        invalidate_cache()
+        self.assertEqual(parallel, read("./configs/merge/main.yaml"))
+
+        # imports of deep sections are prefetched, missing files are
+        # reported by the sequential read
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "leaf.yaml").write_text("a: 1\n")
+            Path(tmp, "deep.yaml").write_text("{a: " * 64 + "{_import_: [leaf.yaml]}" + "}" * 64)
+            Path(tmp, "main.yaml").write_text("_import_: [deep.yaml, missing.yaml]\n")
+            invalidate_cache()
+            with ThreadPoolExecutor(2) as executor:
+                prefetch(Path(tmp, "main.yaml").resolve(), executor)
+            self.assertIn(Path(tmp, "leaf.yaml").resolve(), CACHE)
+            with self.assertRaises(RuntimeError):
+                read(Path(tmp, "main.yaml"), workers=2)
+
+        node = JetNode({"_import_": "leaf.yaml"})
+        for _ in range(5000):
+            node = JetNode({"a": [node]}, recursive=False)
+        self.assertEqual(_find_imports(node), ["leaf.yaml"])
+
+
+class ImportContext(unittest.TestCase):
+    def test_circular(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "first.yaml").write_text("_import_: second.yaml\n")
+            Path(tmp, "second.yaml").write_text("_import_: first.yaml\n")
+            with self.assertRaises(RuntimeError) as error:
+                read(Path(tmp, "first.yaml"))
+            self.assertNotIsInstance(error.exception.__context__, RecursionError)
+
+    def test_threads(self):
+        expected = read("./configs/merge/main.yaml")
+        with ThreadPoolExecutor(8) as executor:
+            trees = list(executor.map(read, ["./configs/merge/main.yaml"] * 32))
+        for tree in trees:
+            self.assertEqual(tree, expected)
+            self.assertEqual(sources(tree), sources(expected))
+
+
+class YamlBackends(unittest.TestCase):
+    def tearDown(self):
+        set_yaml_backend(None)
+
+    @unittest.skipIf("c" not in BACKENDS, "pyyaml is compiled without libyaml")
+    def test_identical_trees(self):
+        for path in Path("./configs").glob("**/*.yaml"):
+            set_yaml_backend("python")
+            python_tree = read_yaml(path)
+            set_yaml_backend("c")
+            c_tree = read_yaml(path)
+            self.assertEqual(python_tree, c_tree)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            set_yaml_backend("unknown")
+
+    def test_aliases(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "aliases.yaml")
+            path.write_text("a: &x {k: 1, l: [{m: 1}]}\nb: *x\nc:\n  <<: *x\n")
+            for backend in BACKENDS:
+                set_yaml_backend(backend)
+                tree = read_yaml(path)
+                # every alias is an independent node
+                tree.b.k = 2
+                tree.c.l[0].m = 2
+                self.assertEqual(tree.a, {"k": 1, "l": [{"m": 1}]})
+                self.assertEqual(tree.b, {"k": 2, "l": [{"m": 1}]})
+
+            # collections under a top level sequence are filled later
+            path.write_text("- &x [1, 2]\n- *x\n- [&y [3], *y]\n")
+            for backend in BACKENDS:
+                set_yaml_backend(backend)
+                tree = read_yaml(path)
+                self.assertEqual(tree, {0: [1, 2], 1: [1, 2], 2: [[3], [3]]})
+                self.assertIsNot(tree[0], tree[1])
+
+
+class Snapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        shutil.copytree("./configs/merge", self.tmp / "merge")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_roundtrip(self):
+        node = JetConfig.read(self.tmp / "merge" / "main.yaml")
+        JetConfig.save(node, self.tmp / "main.jetc")
+        self.assertEqual(JetConfig.read(self.tmp / "main.jetc"), node)
+
+    def test_stale(self):
+        node = JetConfig.read(self.tmp / "merge" / "main.yaml")
+        JetConfig.save(node, self.tmp / "main.jetc")
+
+        source = self.tmp / "merge" / "merge.yaml"
+        source.write_text(source.read_text().replace("c: 3", "c: 33"))
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            stale = JetConfig.read(self.tmp / "main.jetc")
+        self.assertEqual(stale["section"]["c"], 33)
+
+    def test_graph(self):
+        node = JetConfig.read(self.tmp / "merge" / "main.yaml")
+        graph = import_graph(node)
+        main, imported = (self.tmp / "merge" / "main.yaml").resolve(), \
+            (self.tmp / "merge" / "merge.yaml").resolve()
+        self.assertEqual(list(graph.files), [main, imported])
+        self.assertEqual(graph.imports(main), [(imported, None)])
+
+    def test_cache_dir(self):
+        path, cache = self.tmp / "merge" / "main.yaml", self.tmp / "cache"
+        node = JetConfig.read(path, cache_dir=cache)
+        self.assertEqual(len(list(cache.iterdir())), 1)
+
+        invalidate_cache()
+        cached = JetConfig.read(path, cache_dir=cache)
+        self.assertEqual(cached, node)
+        self.assertEqual(import_graph(cached).digest(), import_graph(node).digest())
+
+        source = self.tmp / "merge" / "merge.yaml"
+        source.write_text(source.read_text().replace("c: 3", "c: 33"))
+        self.assertEqual(JetConfig.read(path, cache_dir=cache)["section"]["c"], 33)
+
+    def test_override(self):
+        path, cache = self.tmp / "lr.yaml", self.tmp / "cache"
+        path.write_text("lr: 0.1\noptim:\n  lr: ${lr}\n")
+        JetConfig.save(JetConfig.read(path, cache_dir=cache), self.tmp / "lr.jetc")
+
+        invalidate_cache()
+        for node in (JetConfig.read(path, cache_dir=cache), JetConfig.read(self.tmp / "lr.jetc")):
+            self.assertEqual(JetConfig.override(node, {"lr": 0.5}).optim.lr, 0.5)
+
+
+class Watch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        shutil.copytree("./configs/merge", self.tmp / "merge")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_poll(self):
+        calls = []
+        watcher = Watcher(self.tmp / "merge" / "main.yaml", lambda *args: calls.append(args))
+        self.assertFalse(watcher.poll())
+
+        source = self.tmp / "merge" / "merge.yaml"
+        source.write_text(source.read_text().replace("d: 4", "d: 44\n  e: 5"))
+        self.assertTrue(watcher.poll())
+
+        tree, changes = calls[-1]
+        self.assertCountEqual(changes.changed, ["section.sub2.d", "section.d"])
+        self.assertEqual(changes.added, ["section.e"])
+        self.assertEqual(tree, JetConfig.read(self.tmp / "merge" / "main.yaml"))
+
+
+class Merge(unittest.TestCase):
+    def test_escape(self):
+        dst = JetNode({"model!": {"a": 1, "b": 2}, "optim": {"lr": 1}, "seed": 0})
+        src = JetNode({"model": {"a": 3}, "optim!": {"wd": 1}, "new!": {"c": 1}})
+        merged = merge(dst, src)
+        self.assertEqual(merged, {"model!": {"a": 3, "b": 2}, "optim": {"wd": 1},
+                                  "seed": 0, "new": {"c": 1}})
+        # plain key wins if both spellings are present
+        self.assertEqual(merge(JetNode({"a": {"x": 1}}), JetNode({"a!": {"y": 1}, "a": {"z": 1}})),
+                         {"a": {"x": 1, "z": 1}})
+        with self.assertRaises(SyntaxError):
+            merge(JetNode({"a": 1}), JetNode({"a-b": 1}))
+
+
+class Diff(unittest.TestCase):
+    def test_diff(self):
+        a = JetNode({"model!": {"size": 1}, "layers": [1, 2, 3], "lr": 0.1,
+                     "data": {"path": "/data", "name": "x"}})
+        b = JetNode({"model!": {"size": 2}, "layers": [1, 5], "lr": 0.1,
+                     "data": {"path": "/data"}, "seed": 0})
+        changes = diff(a, b)
+        self.assertEqual(changes.added, ["seed"])
+        self.assertEqual(changes.removed, ["layers.2", "data.name"])
+        self.assertEqual(changes.changed, ["model.size", "layers.1"])
+
+        b = JetNode({"model": {"size": 1}, "layers": a.layers, "lr": 1, "data": a.data})
+        self.assertEqual(diff(a, b).changed, ["model", "lr"])
+        self.assertFalse(diff(a, a))
+
+        # "x" wins over "x!" as in merge
+        a = JetNode({"x": {"size": 1}, "x!": {"size": 2}})
+        self.assertFalse(diff(a, JetNode({"x": {"size": 1}})))
+
+
+class Fingerprint(unittest.TestCase):
+    def test_fingerprint(self):
+        node = JetNode({"model": {"size": 1, "name": "mlp"}, "layers": [{"size": 1}]})
+        same = JetNode({"layers": [{"size": 1}], "model": {"name": "mlp", "size": 1}})
+        self.assertEqual(node.fingerprint(), same.fingerprint())
+        self.assertNotEqual(node.fingerprint(), JetNode({"model": {"size": 1.0}}).fingerprint())
+
+        before = node.fingerprint()
+        node.model.size = 2
+        self.assertNotEqual(node.fingerprint(), before)
+        node.layers[0].size = 2
+        self.assertNotEqual(node.fingerprint(), same.fingerprint())
+
+        copied = pickle.loads(pickle.dumps(node))
+        self.assertEqual(copied.fingerprint(), node.fingerprint())
+
+    def test_fingerprint_deep(self):
+        node = leaf = JetNode({"size": 1})
+        for _ in range(3000):
+            node = JetNode({"child": node, "items": [node]}, recursive=False)
+        before = node.fingerprint()
+        leaf.size = 2
+        self.assertNotEqual(node.fingerprint(), before)
+
+        # links to collected parents are removed
+        for _ in range(10):
+            JetNode({"leaf": leaf}, recursive=False).fingerprint()
+        self.assertEqual(len(vars(leaf)["__parents__"]), 1)
+
+
+class Interpolation(unittest.TestCase):
+    def test_chained(self):
+        node = JetNode({
+            "path": "${root}/${name}",
+            "root": "${base}/runs",
+            "base": "/data",
+            "name": "exp",
+            "copy": {"value": "${path}", "section": "${paths}"},
+            "paths": {"log": "${path}/log"},
+        })
+        result = interpolate(node)
+        self.assertEqual(result["path"], "/data/runs/exp")
+        self.assertEqual(result["copy"]["value"], "/data/runs/exp")
+        self.assertEqual(result["copy"]["section"]["log"], "/data/runs/exp/log")
+        # source tree stays untouched
+        self.assertEqual(node["path"], "${root}/${name}")
+
+    def test_override(self):
+        node = interpolate(JetNode({
+            "lr": 0.1,
+            "optim": {"lr": "${lr}", "name": "adam"},
+            "run": "${optim.name}_${optim.lr}",
+        }))
+        node.override({"lr": 0.5})
+        self.assertEqual(node.optim.lr, 0.5)
+        self.assertEqual(node.run, "adam_0.5")
+
+        node.override({"optim!": {"name": "sgd", "lr": "${lr}"}})
+        self.assertEqual(node.run, "sgd_0.5")
+
+    def test_override_mutated(self):
+        source = JetNode({"lr": 0.1, "optim": {"lr": "${lr}"}, "layers": [1, {"size": 2}]})
+
+        # changes made outside of override are taken into account
+        node = interpolate(source)
+        del node["optim"]
+        self.assertEqual(node.override({"lr": 0.5}).lr, 0.5)
+
+        node = interpolate(source)
+        node.merge(JetNode({"sched": {"lr": "${lr}"}}))
+        node.override({"lr": 0.5})
+        self.assertEqual((node.optim.lr, node.sched.lr), (0.5, 0.5))
+
+        node = interpolate(source)
+        node.optim.lr = 0.3
+        node.override({"lr": 0.5})
+        self.assertEqual(node.optim.lr, 0.3)
+
+        # integer keys address list items
+        node.override({"layers.0": 5, "layers.1.size": 7})
+        self.assertEqual(node.layers, [5, {"size": 7}])
+        with self.assertRaises(ValueError):
+            node.override({"layers.2": 1})
+
+    def test_circular(self):
+        with self.assertRaises(RuntimeError):
+            interpolate(JetNode({"first": "${second}", "second": "${first}"}))
+
+
+class Sweep(unittest.TestCase):
+    def setUp(self):
+        self.base = interpolate(JetNode({
+            "lr": 0.1,
+            "optim": {"lr": "${lr}", "name": "adam"},
+            "data": {"path": "/data", "splits": [1, 2]},
+        }))
+
+    def test_grid(self):
+        variants = list(grid(self.base, {"lr": [0.1, 0.5], "optim.name": ["adam", "sgd"]}))
+        self.assertEqual(len(variants), 4)
+        self.assertEqual(variants[1].node.optim.lr, 0.1)
+        self.assertEqual(variants[3].node.optim.name, "sgd")
+        self.assertEqual(variants[3].node.optim.lr, 0.5)
+        # unchanged subtrees are shared, base is untouched
+        self.assertIs(variants[0].node.data, self.base.data)
+        self.assertEqual(self.base.optim.lr, 0.1)
+        self.assertEqual(len({v.key for v in variants}), 4)
+
+        variants = list(grid(self.base, {"data.splits.1": [3]}))
+        self.assertEqual(variants[0].node.data.splits, [1, 3])
+        self.assertEqual(self.base.data.splits, [1, 2])
+
+    def test_zipped_sample(self):
+        with self.assertRaises(ValueError):
+            list(zipped(self.base, {"lr": [1, 2], "optim.name": ["sgd"]}))
+
+        first = [v.key for v in sample(self.base, {"lr": lambda r: r.random()}, 3, seed=0)]
+        second = [v.key for v in sample(self.base, {"lr": lambda r: r.random()}, 3, seed=0)]
+        self.assertEqual(first, second)
+
+
+class Profiling(unittest.TestCase):
+    def test_events(self):
+        node = JetNode({
+            "name": "exp",
+            "model": {"_cls_": "__main__.CLS", "a": "${name}",
+                      "b": {"_fn_": "__main__.FN", "a": 1}},
+        })
+        with profile(memory=True) as prof:
+            JetConfig.build(interpolate(node))
+            JetConfig.build(node, workers=2)
+        self.assertEqual(LISTENERS, [])
+
+        built = [(e.name, e.path) for e in prof.events if e.phase == "build"]
+        self.assertEqual(built, [("__main__.FN", "model.b"), ("__main__.CLS", "model")] * 2)
+        self.assertEqual([e.path for e in prof.events if e.phase == "interpolate"], ["model.a"])
+        self.assertTrue(all(e.memory is not None for e in prof.events))
+        self.assertEqual(prof.slowest("build", n=1, by="path")[0][2], 2)
+        self.assertIn("model.b", prof.summary())
+
+
 if __name__ == "__main__":
     unittest.main()